@@ -1 +1 @@
-python3 src/main.py /static_site_boot.dev/
+PYTHONPATH=src python3 -m static_site /static_site_boot.dev/
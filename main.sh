@@ -1,2 +1 @@
-python3 src/main.py
-cd public && python3 -m http.server 8888
+PYTHONPATH=src python3 -m static_site serve --watch --port 8888
@@ -1,26 +0,0 @@
-from .textnode import TextNode, TextType
-from .htmlnode import HTMLNode, LeafNode, ParentNode
-from .functions import (
-    text_node_to_html_node,
-    split_nodes_delimiter,
-    extract_markdown_images,
-    extract_markdown_links,
-    split_nodes_link,
-    split_nodes_image,
-    text_to_textnodes,
-)
-
-__all__ = [
-    TextNode,
-    TextType,
-    HTMLNode,
-    LeafNode,
-    ParentNode,
-    text_node_to_html_node,
-    split_nodes_delimiter,
-    extract_markdown_images,
-    extract_markdown_links,
-    split_nodes_link,
-    split_nodes_image,
-    text_to_textnodes,
-]  # type:ignore
@@ -0,0 +1,278 @@
+"""
+Build benchmark on a synthetic content tree.
+
+Generates a content/ tree of the requested size and shape, times every stage
+of the pipeline over it and writes throughput and peak memory as JSON, so
+runs can be compared between commits.
+
+    python3 src/bench_build.py --pages 2000 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.functions import (
+    block_to_block_type,
+    generate_pages,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    text_to_textnodes,
+)
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog elves ring hobbit shire river "
+    "mountain road wizard tower forest song light shadow king return"
+).split()
+
+BLOCK_MIX = {
+    "paragraph": 6,
+    "heading": 2,
+    "unordered_list": 2,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1,
+}
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head><title>{{ Title }}</title><link href="/index.css" rel="stylesheet" /></head>
+  <body><article>{{ Content }}</article></body>
+</html>
+"""
+
+
+def _sentence(rng: random.Random, inline_density: float, words=12) -> str:
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < inline_density:
+            word = rng.choice(
+                (
+                    f"**{word}**",
+                    f"_{word}_",
+                    f"`{word}`",
+                    f"[{word}](/{word}/page_{rng.randrange(100)})",
+                    f"![{word}](/images/{word}.png)",
+                )
+            )
+        parts.append(word)
+    return " ".join(parts)
+
+
+def _block(rng: random.Random, kind: str, inline_density: float) -> str:
+    match kind:
+        case "heading":
+            return "#" * rng.randint(2, 4) + " " + _sentence(rng, inline_density, 4)
+        case "unordered_list":
+            return "\n".join(
+                "- " + _sentence(rng, inline_density, 6)
+                for _ in range(rng.randint(2, 6))
+            )
+        case "ordered_list":
+            return "\n".join(
+                f"{i}. " + _sentence(rng, inline_density, 6)
+                for i in range(1, rng.randint(3, 7))
+            )
+        case "quote":
+            return "\n".join(
+                "> " + _sentence(rng, inline_density) for _ in range(rng.randint(1, 3))
+            )
+        case "code":
+            lines = [f"    {rng.choice(WORDS)}({i})" for i in range(rng.randint(2, 8))]
+            return "```\ndef main():\n" + "\n".join(lines) + "\n```"
+        case _:
+            return "\n".join(
+                _sentence(rng, inline_density) for _ in range(rng.randint(1, 4))
+            )
+
+
+def generate_page_markdown(
+    rng: random.Random, blocks: int, inline_density: float, block_mix=BLOCK_MIX
+) -> str:
+    kinds = rng.choices(list(block_mix), weights=list(block_mix.values()), k=blocks)
+    body = [_block(rng, kind, inline_density) for kind in kinds]
+    return "\n\n".join(["# " + _sentence(rng, 0, 5)] + body) + "\n"
+
+
+def generate_corpus(
+    root,
+    pages=200,
+    blocks=20,
+    inline_density=0.2,
+    depth=2,
+    fanout=8,
+    block_mix=BLOCK_MIX,
+    seed=0,
+) -> list[Path]:
+    """
+    Writes pages markdown files under root, spread over directories nested up
+    to depth levels with fanout subdirectories each, and returns their paths.
+    The same arguments always produce the same tree.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    paths = []
+    for index in range(pages):
+        parts = [
+            f"section{rng.randrange(fanout)}" for _ in range(rng.randint(0, depth))
+        ]
+        path = root.joinpath(*parts, f"page{index}", "index.md")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(generate_page_markdown(rng, blocks, inline_density, block_mix))
+        paths.append(path)
+    return paths
+
+
+def _time(function, items) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [function(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def _read(path):
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _write(job):
+    path, html = job
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(html)
+
+
+def run_benchmark(content_dir, output_dir) -> dict:
+    """
+    Times each stage separately over every page under content_dir, then a full
+    generate_pages run, and records the peak memory of a traced full run.
+    """
+    content_dir, output_dir = Path(content_dir), Path(output_dir)
+    paths = sorted(content_dir.rglob("*.md"))
+    template_path = content_dir.parent / "bench_template.html"
+    template_path.write_text(TEMPLATE)
+    stages = {}
+
+    stages["read"], documents = _time(_read, paths)
+    stages["markdown_to_blocks"], page_blocks = _time(markdown_to_blocks, documents)
+    blocks = [block for page in page_blocks for block in page]
+    stages["block_to_block_type"], _ = _time(block_to_block_type, blocks)
+    stages["text_to_textnodes"], _ = _time(text_to_textnodes, blocks)
+    stages["markdown_to_html_node"], nodes = _time(markdown_to_html_node, documents)
+    stages["to_html"], html = _time(lambda node: node.to_html(), nodes)
+    jobs = [
+        (output_dir / "stages" / path.relative_to(content_dir).with_suffix(".html"), h)
+        for path, h in zip(paths, html)
+    ]
+    stages["write"], _ = _time(_write, jobs)
+
+    page_jobs = [
+        (path, output_dir / "full" / path.relative_to(content_dir).with_suffix(".html"))
+        for path in paths
+    ]
+    with redirect_stdout(StringIO()):
+        start = time.perf_counter()
+        generate_pages(page_jobs, template_path, "/")
+        stages["generate_pages"] = time.perf_counter() - start
+        # a second, traced run so tracemalloc doesn't skew the timing above
+        tracemalloc.start()
+        generate_pages(page_jobs, template_path, "/")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    source_mb = sum(len(doc.encode()) for doc in documents) / 1e6
+    return {
+        "pages": len(paths),
+        "source_mb": round(source_mb, 3),
+        "peak_memory_bytes": peak,
+        "stages": {
+            name: {
+                "seconds": round(seconds, 6),
+                "pages_per_s": round(len(paths) / seconds, 1) if seconds else None,
+                "mb_per_s": round(source_mb / seconds, 2) if seconds else None,
+            }
+            for name, seconds in stages.items()
+        },
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=20, help="blocks per page")
+    parser.add_argument(
+        "--inline-density",
+        type=float,
+        default=0.2,
+        help="share of words wrapped in inline markup",
+    )
+    parser.add_argument("--depth", type=int, default=2, help="max directory depth")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--mix",
+        type=json.loads,
+        default=BLOCK_MIX,
+        help='block type weights as JSON, e.g. \'{"paragraph": 1, "code": 1}\'',
+    )
+    parser.add_argument("--keep", type=Path, help="write the corpus here and keep it")
+    parser.add_argument("--output", type=Path, help="write the JSON results here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    corpus = {
+        "pages": args.pages,
+        "blocks": args.blocks,
+        "inline_density": args.inline_density,
+        "depth": args.depth,
+        "seed": args.seed,
+        "block_mix": args.mix,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.keep or Path(tmp)
+        generate_corpus(
+            root / "content",
+            args.pages,
+            args.blocks,
+            args.inline_density,
+            args.depth,
+            block_mix=args.mix,
+            seed=args.seed,
+        )
+        results = run_benchmark(root / "content", Path(tmp) / "out")
+    results = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "corpus": corpus,
+        **results,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,136 @@
+"""
+Import time benchmark for the command line entry points.
+
+Imports each module in fresh interpreters with `python -X importtime`, keeps
+the fastest run and fails when it is over its budget, or when it imports a
+module that should only be loaded on demand. Run it after touching imports:
+
+    python3 src/bench_import.py [--runs 5] [--budget static_site.main=10]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent
+
+# budgets are multiples of the time REFERENCE takes to import on the same
+# machine, so they hold on slower ones; about twice the 6x, 2x and 5x measured
+REFERENCE = "argparse"
+BUDGETS = {"static_site.main": 12, "static_site.client": 4, "static_site.api": 10}
+
+# modules each entry point must leave to the code paths that need them
+LAZY = {
+    "static_site.main": (
+        "asyncio",
+        "concurrent.futures",
+        "tomllib",
+        "gzip",
+        "socket",
+        "static_site.asyncbuild",
+        "static_site.compress",
+        "static_site.listings",
+        "static_site.images",
+        "static_site.serve",
+        "static_site.daemon",
+    ),
+    "static_site.client": (
+        "static_site.functions",
+        "static_site.blockcache",
+        "static_site.template",
+        "static_site.inline",
+    ),
+    "static_site.api": ("asyncio", "concurrent.futures", "tomllib", "socket"),
+}
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """
+    Maps each module in `-X importtime` output to its cumulative microseconds.
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_time(module: str, runs=5) -> float:
+    """
+    The fastest of runs cold imports of module, in milliseconds.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=SRC,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        us = parse_importtime(result.stderr)[module]
+        best = us if best is None else min(best, us)
+    return best / 1000
+
+
+def eager_imports(module: str, lazy=()) -> list[str]:
+    """
+    The modules of lazy that importing module loads anyway.
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print('\\n'.join(m for m in {tuple(lazy)!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="MODULE=TIMES",
+        help=f"override or add a budget, in multiples of {REFERENCE} (repeatable)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    budgets = dict(BUDGETS)
+    for budget in args.budget:
+        module, _, ms = budget.partition("=")
+        budgets[module] = float(ms)
+    reference = import_time(REFERENCE, args.runs)
+    print(f"{REFERENCE:<20} {reference:7.1f} ms  (reference)")
+    failed = False
+    for module, budget in budgets.items():
+        ms = import_time(module, args.runs)
+        eager = eager_imports(module, LAZY.get(module, ()))
+        ok = ms <= budget * reference and not eager
+        failed = failed or not ok
+        line = (
+            f"{module:<20} {ms:7.1f} ms  "
+            f"(budget {budget * reference:.1f} ms, {budget:g}x)"
+        )
+        if eager:
+            line += f"  imports eagerly: {', '.join(eager)}"
+        print(f"{line}  {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,149 @@
+"""
+Per-call microbenchmark for the inline and block parsing functions.
+
+Times the current compiled-pattern and dispatch-table implementations against
+copies of the previous raw-pattern and if/elif ones on the same inputs, and
+prints the microseconds per call for each.
+
+    python3 src/bench_inline.py [number]
+"""
+
+import re
+import sys
+import timeit
+
+from static_site.blocks import BlockType
+from static_site.functions import (
+    block_to_block_type,
+    extract_markdown_images,
+    extract_markdown_links,
+    split_nodes_image,
+    split_nodes_link,
+)
+from static_site.textnode import TextNode, TextType
+
+TEXT = (
+    "This is **bold** text with an ![image](https://i.imgur.com/zjjcJKZ.png), "
+    "a [link](https://boot.dev) and _italic_ words, then `code` and another "
+    "[link](https://www.youtube.com/@bootdotdev) to finish."
+)
+
+BLOCKS = [
+    "# heading",
+    "```\ncode\n```",
+    "> quote",
+    "- item\n- item",
+    "1. one\n2. two",
+    "just a paragraph of words",
+]
+
+
+def legacy_extract_markdown_images(text):
+    pattern = r"\!\[([^\]]*)\]\(([^)]*)\)"
+    return re.findall(pattern, text)
+
+
+def legacy_extract_markdown_links(text):
+    pattern = r"\[([^\]]*)\]\(([^)]*)\)"
+    return re.findall(pattern, text)
+
+
+def _legacy_split(old_nodes, pattern, extract, text_type):
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        splits = re.split(pattern, node.text)
+        for index, split in enumerate(splits):
+            if not split:
+                continue
+            if index % 2 == 0:
+                new_nodes.append(TextNode(split, node.text_type))
+            else:
+                matches = extract(split)[0]
+                new_nodes.append(TextNode(matches[0], text_type, url=matches[1]))
+    return new_nodes
+
+
+def legacy_split_nodes_image(old_nodes):
+    return _legacy_split(
+        old_nodes,
+        r"(\!\[[^\]]*\]\([^)]*\))",
+        legacy_extract_markdown_images,
+        TextType.IMAGE,
+    )
+
+
+def legacy_split_nodes_link(old_nodes):
+    return _legacy_split(
+        old_nodes,
+        r"(\[[^\]]*\]\([^)]*\))",
+        legacy_extract_markdown_links,
+        TextType.LINK,
+    )
+
+
+def legacy_block_to_block_type(block):
+    if block.startswith("#"):
+        return BlockType.HEADING
+    elif block.startswith("```"):
+        return BlockType.CODE
+    elif block.startswith(">"):
+        return BlockType.QUOTE
+    elif block.startswith("-"):
+        return BlockType.UNORDERED_LIST
+    elif block.startswith("1."):
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+
+def _every_block(function):
+    return lambda: [function(block) for block in BLOCKS]
+
+
+def measure(function, number) -> float:
+    """
+    Returns the best microseconds per call out of five timeit runs.
+    """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=20_000):
+    nodes = [TextNode(TEXT, TextType.TEXT)]
+    cases = [
+        (
+            "extract_markdown_images",
+            lambda: legacy_extract_markdown_images(TEXT),
+            lambda: extract_markdown_images(TEXT),
+        ),
+        (
+            "extract_markdown_links",
+            lambda: legacy_extract_markdown_links(TEXT),
+            lambda: extract_markdown_links(TEXT),
+        ),
+        (
+            "split_nodes_image",
+            lambda: legacy_split_nodes_image(nodes),
+            lambda: split_nodes_image(nodes),
+        ),
+        (
+            "split_nodes_link",
+            lambda: legacy_split_nodes_link(nodes),
+            lambda: split_nodes_link(nodes),
+        ),
+        (
+            "block_to_block_type",
+            _every_block(legacy_block_to_block_type),
+            _every_block(block_to_block_type),
+        ),
+    ]
+    print(f"{'function':<26}{'before':>11}{'after':>11}{'saved':>8}")
+    for name, before, after in cases:
+        old, new = measure(before, number), measure(after, number)
+        print(f"{name:<26}{old:>8.2f} us{new:>8.2f} us{1 - new / old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
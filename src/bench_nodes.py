@@ -0,0 +1,91 @@
+"""
+Memory benchmark for the node classes.
+
+Builds the same node trees with the current slotted TextNode/HTMLNode classes
+and with dict-backed copies of the previous implementation, and prints the
+bytes allocated per node for each.
+
+    python3 src/bench_nodes.py [count]
+"""
+
+import sys
+import tracemalloc
+
+from static_site.htmlnode import LeafNode, ParentNode
+from static_site.textnode import TextNode, TextType
+
+
+class LegacyTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = TextType(text_type)
+        self.url = url
+
+
+class LegacyHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children or []
+        self.props = props or {}
+
+
+class LegacyLeafNode(LegacyHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag, value, props=props)
+
+
+class LegacyParentNode(LegacyHTMLNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag, None, children=children, props=props)
+
+
+def _text_nodes(cls, count):
+    return [cls("some words", TextType.TEXT) for _ in range(count)]
+
+
+def _html_nodes(leaf, parent, count):
+    # one <p> for every four leaves, the shape of a typical paragraph
+    nodes = []
+    for _ in range(count // 5):
+        children = [
+            leaf(None, "some words"),
+            leaf("b", "bold"),
+            leaf(None, "more words"),
+            leaf("a", "link", {"href": "/x"}),
+        ]
+        nodes.append(parent("p", children))
+    return nodes
+
+
+def measure(build, count) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / count
+
+
+def main(count=100_000):
+    cases = [
+        (
+            "TextNode",
+            lambda n: _text_nodes(LegacyTextNode, n),
+            lambda n: _text_nodes(TextNode, n),
+        ),
+        (
+            "HTMLNode tree",
+            lambda n: _html_nodes(LegacyLeafNode, LegacyParentNode, n),
+            lambda n: _html_nodes(LeafNode, ParentNode, n),
+        ),
+    ]
+    print(f"{'nodes':<16}{'before':>12}{'after':>12}{'saved':>8}")
+    for name, before, after in cases:
+        old, new = measure(before, count), measure(after, count)
+        print(f"{name:<16}{old:>10.1f} B{new:>10.1f} B{1 - new / old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
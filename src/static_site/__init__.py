@@ -0,0 +1,37 @@
+from importlib import import_module
+
+# public name -> the module defining it, imported on first use so that
+# importing the package (or one name from it) stays cheap
+_EXPORTS = {
+    "TextNode": "textnode",
+    "TextType": "textnode",
+    "HTMLNode": "htmlnode",
+    "LeafNode": "htmlnode",
+    "ParentNode": "htmlnode",
+    "text_node_to_html_node": "functions",
+    "split_nodes_delimiter": "functions",
+    "extract_markdown_images": "functions",
+    "extract_markdown_links": "functions",
+    "split_nodes_link": "functions",
+    "split_nodes_image": "functions",
+    "text_to_textnodes": "functions",
+    "markdown_to_html_node": "functions",
+    "generate_page": "functions",
+    "Renderer": "api",
+    "render": "api",
+    "render_many": "api",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
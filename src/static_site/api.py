@@ -0,0 +1,125 @@
+"""
+Rendering markdown from memory, for embedding the renderer in other programs.
+
+    from static_site.api import render, render_many
+
+    html = render("# Hello\n\nSome **bold** text")
+    pages = list(render_many(["# One", ("# Two", {"author": "Sam"})]))
+
+Nothing here reads or writes files.
+"""
+
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from .blockcache import BlockCache
+from .blockstream import MarkdownReader, MissingTitleError
+from .frontmatter import as_context
+from .functions import StreamedContent
+from .highlight import highlight
+from .template import Template
+
+# renders just the content <div>, as markdown_to_html_node does
+CONTENT_ONLY = "{{ Content }}"
+WARM_UP = "# Title\n\n**bold** _italic_ `code` [link](/a) ![image](/b.png)\n\n- item"
+
+
+@lru_cache(maxsize=64)
+def _compile(source: str) -> Template:
+    return Template(source)
+
+
+class Renderer:
+    def __init__(
+        self, template: str | Template | None = None, basepath="/", cache_size=4096
+    ):
+        """
+        A reusable renderer. The template is compiled once and the parsing
+        paths are warmed up when it is created, so the first real call is as
+        fast as the rest. Not thread safe, use one per thread.
+
+        template - template source (not a path) or a Template, by default
+        just the content <div>
+        basepath - prefix for root relative links and images
+        cache_size - rendered blocks kept for reuse across calls, 0 for none;
+        the cache is this renderer's own, never the build's, and code is
+        highlighted without the build's on-disk highlight cache
+        """
+        self.template = self._template(template) or _compile(CONTENT_ONLY)
+        self.basepath = basepath
+        self.cache = BlockCache(cache_size) if cache_size else None
+        self.render(WARM_UP)
+        if self.cache is not None:
+            self.cache.entries.clear()
+            self.cache.take_stats()
+
+    @staticmethod
+    def _template(template: str | Template | None) -> Template | None:
+        if template is None or isinstance(template, Template):
+            return template
+        return _compile(template)
+
+    def render(
+        self,
+        markdown: str,
+        *,
+        template: str | Template | None = None,
+        context: dict | None = None,
+    ) -> str:
+        """
+        Renders markdown into the template and returns the html.
+
+        Front matter values and Title (empty when the markdown has none) are
+        available to the template, context adds to or overrides them. Invalid
+        front matter raises ValueError.
+        """
+        template = self._template(template) or self.template
+        reader = MarkdownReader.from_string(markdown)
+        try:
+            title = reader.read_title()
+        except MissingTitleError:
+            title = ""
+        values = {**as_context(reader.metadata), "Title": title, **(context or {})}
+        values["Content"] = StreamedContent(
+            reader, self.basepath, self.cache, highlight
+        )
+        return template.with_basepath(self.basepath).render(values)
+
+    def render_many(
+        self, items: Iterable[str | tuple[str, dict]], *, template=None
+    ) -> Iterator[str]:
+        """
+        Renders each item lazily, in order. An item is markdown, or a
+        (markdown, context) pair.
+        """
+        for item in items:
+            markdown, context = (item, None) if isinstance(item, str) else item
+            yield self.render(markdown, template=template, context=context)
+
+
+_default: Renderer | None = None
+
+
+def default_renderer() -> Renderer:
+    global _default
+    if _default is None:
+        _default = Renderer()
+    return _default
+
+
+def render(
+    markdown: str,
+    *,
+    template: str | Template | None = None,
+    context: dict | None = None,
+) -> str:
+    """
+    Renders markdown with the shared default Renderer.
+    """
+    return default_renderer().render(markdown, template=template, context=context)
+
+
+def render_many(
+    items: Iterable[str | tuple[str, dict]], *, template=None
+) -> Iterator[str]:
+    return default_renderer().render_many(items, template=template)
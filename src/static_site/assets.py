@@ -0,0 +1,160 @@
+import hashlib
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+
+from .instrument import log
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+# linux/fcntl.h and linux/fs.h, for renameat2
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+def hash_file(path) -> str:
+    """
+    Returns the sha256 hex digest of a file, read in chunks so large assets
+    never have to be held in memory.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def reflink(source, destination) -> bool:
+    """
+    Clones source into destination with copy-on-write (btrfs, xfs, ...).
+    Returns False where the platform or filesystem can't, so the caller can
+    fall back to a real copy.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        Path(destination).unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+def copy_file(source, destination):
+    if not reflink(source, destination):
+        shutil.copy2(source, destination)
+
+
+def link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        copy_file(source, destination)
+
+
+def unchanged(source: Path, previous: Path, compare: str = "mtime") -> bool:
+    """
+    Tells whether the previous output of an asset still matches its source,
+    by size and mtime (copies keep the mtime) or by content hash.
+    """
+    try:
+        src, prev = source.stat(), previous.stat()
+    except FileNotFoundError:
+        return False
+    if src.st_size != prev.st_size:
+        return False
+    if compare == "hash":
+        return hash_file(source) == hash_file(previous)
+    return src.st_mtime_ns == prev.st_mtime_ns
+
+
+def sync_assets(source_dir, staging_dir, previous_dir, compare="mtime") -> dict:
+    """
+    Fills staging_dir with the files of source_dir. Files whose output in
+    previous_dir is unchanged are hard linked from there, so their bytes are
+    never rewritten; the rest are reflinked or copied from source_dir. Files
+    that only exist in previous_dir are simply not carried over.
+    """
+    source_dir, staging_dir = Path(source_dir), Path(staging_dir)
+    previous_dir = Path(previous_dir)
+    counts = {"linked": 0, "copied": 0}
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        rel_root = Path(root).relative_to(source_dir)
+        (staging_dir / rel_root).mkdir(parents=True, exist_ok=True)
+        for name in sorted(files):
+            source = Path(root) / name
+            previous = previous_dir / rel_root / name
+            destination = staging_dir / rel_root / name
+            if unchanged(source, previous, compare):
+                link_or_copy(previous, destination)
+                counts["linked"] += 1
+            else:
+                copy_file(source, destination)
+                log(f"Copied {source} to {destination}")
+                counts["copied"] += 1
+    return counts
+
+
+def exchange(first, second) -> bool:
+    """
+    Swaps two paths in one atomic step with renameat2(RENAME_EXCHANGE).
+    Returns False where the platform or filesystem can't, so the caller can
+    fall back to plain renames.
+    """
+    try:
+        import ctypes
+
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (ImportError, OSError, AttributeError):
+        return False
+    result = renameat2(
+        AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), RENAME_EXCHANGE
+    )
+    return result == 0
+
+
+def swap_in(staging_dir, destination_dir):
+    """
+    Replaces destination_dir with staging_dir. Where renameat2 is available
+    (Linux) the two are exchanged atomically, so readers always see the old
+    tree or the new one. Elsewhere it takes two renames, and destination_dir
+    is briefly missing between them, though never half written.
+    """
+    staging_dir, destination_dir = Path(staging_dir), Path(destination_dir)
+    if destination_dir.exists() and exchange(staging_dir, destination_dir):
+        # staging_dir now holds the old tree
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return
+    old = destination_dir.with_name(f".{destination_dir.name}.old")
+    if old.exists():
+        shutil.rmtree(old)
+    if destination_dir.exists():
+        destination_dir.rename(old)
+    staging_dir.rename(destination_dir)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+@contextmanager
+def staged_output(destination_dir):
+    """
+    Yields an empty staging directory next to destination_dir and swaps it in
+    when the block succeeds. On error the staging directory is discarded and
+    destination_dir is left as it was.
+    """
+    destination_dir = Path(destination_dir)
+    staging_dir = destination_dir.with_name(f".{destination_dir.name}.staging")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+    try:
+        yield staging_dir
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    swap_in(staging_dir, destination_dir)
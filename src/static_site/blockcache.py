@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+# modules whose code decides how a block renders; editing any of them
+# invalidates a persisted cache
+RENDERER_MODULES = (
+    "functions.py",
+    "inline.py",
+    "htmlnode.py",
+    "textnode.py",
+    "highlight.py",
+)
+
+
+def renderer_version() -> str:
+    digest = hashlib.sha256()
+    src = Path(__file__).parent
+    for name in RENDERER_MODULES:
+        digest.update((src / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class BlockCache:
+    def __init__(self, maxsize: int = 4096):
+        """
+        Bounded LRU mapping a block (text, block type and basepath) to its
+        rendered html fragment.
+        maxsize - the most fragments kept, least recently used go first
+        """
+        self.maxsize = maxsize
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.added: dict[str, str] = {}
+
+    @staticmethod
+    def key(block: str, block_type, basepath: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{block_type.value}\0{basepath}\0".encode())
+        digest.update(block.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return html
+
+    def put(self, key: str, html: str, track: bool = True):
+        """
+        track - remember the entry in added, so a worker process can send its
+        new entries back to the parent
+        """
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if track:
+            self.added[key] = html
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def take_stats(self) -> tuple[int, int, dict[str, str]]:
+        """
+        Returns and resets the counters and new entries since the last call.
+        """
+        stats = self.hits, self.misses, self.added
+        self.hits, self.misses, self.added = 0, 0, {}
+        return stats
+
+    def merge(self, hits: int, misses: int, added: dict[str, str]):
+        self.hits += hits
+        self.misses += misses
+        for key, html in added.items():
+            self.put(key, html, track=False)
+
+    def load(self, path):
+        """
+        Loads fragments saved by an earlier build. A missing or unreadable
+        file, or one written by a different renderer, is ignored.
+        """
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != renderer_version():
+            return
+        for key, html in data.get("entries", []):
+            self.put(key, html, track=False)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(
+                {"version": renderer_version(), "entries": list(self.entries.items())},
+                f,
+            )
+        os.replace(tmp, path)
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0
+        return (
+            f"Block cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate)"
+        )
+
+
+_cache: BlockCache | None = None
+
+
+def enable_block_cache(maxsize: int = 4096, path=None) -> BlockCache:
+    """
+    Turns on block caching for markdown_to_html_node, optionally preloaded
+    from the file a previous build saved.
+    """
+    global _cache
+    _cache = BlockCache(maxsize)
+    if path is not None:
+        _cache.load(path)
+    return _cache
+
+
+def disable_block_cache():
+    global _cache
+    _cache = None
+
+
+def block_cache() -> BlockCache | None:
+    return _cache
@@ -0,0 +1,180 @@
+from collections import deque
+from itertools import chain
+from typing import Iterable, Iterator
+
+from .frontmatter import FENCES, parse_front_matter
+from .instrument import profiler, stage
+
+FENCE = "```"
+
+
+def _is_fence(line: str) -> bool:
+    # unindented only, block_to_block_type sees a code block the same way
+    return line.startswith(FENCE)
+
+
+def _timed(lines: Iterable[str]) -> Iterator[str]:
+    """
+    The lines, each read under the read stage. Files are read lazily while
+    the blocks are split, so that is where reading costs.
+    """
+    lines = iter(lines)
+    while True:
+        with stage("read"):
+            line = next(lines, None)
+        if line is None:
+            return
+        yield line
+
+
+class MissingTitleError(ValueError):
+    """
+    The document has neither a front matter title nor a heading.
+    """
+
+
+class MarkdownReader:
+    def __init__(self, lines: Iterable[str]):
+        """
+        Splits markdown into blocks while reading it line by line.
+
+        lines - the document lines, with or without their trailing newline,
+        e.g. an open file
+        """
+        self.title: str | None = None
+        self.metadata: dict | None = None
+        self._lines = iter(lines) if profiler() is None else _timed(lines)
+        self._blocks = self._read_blocks()
+        self._buffer: deque[str] = deque()
+
+    @classmethod
+    def from_string(cls, markdown: str) -> "MarkdownReader":
+        return cls(markdown.split("\n"))
+
+    def _read_blocks(self) -> Iterator[str]:
+        """
+        Blank lines end a block, except inside a ``` fence. A fence always
+        starts and ends its own block, even without blank lines around it.
+        The title is the first # line outside a fence.
+        """
+        block: list[str] = []
+        fenced = False
+        for line in self._lines:
+            line = line.rstrip("\n")
+            if _is_fence(line):
+                if not fenced and block:
+                    yield "\n".join(block)
+                    block = []
+                block.append(line)
+                fenced = not fenced
+                if not fenced:
+                    yield "\n".join(block)
+                    block = []
+                continue
+            if fenced:
+                block.append(line)
+                continue
+            if not line.strip():
+                if block:
+                    yield "\n".join(block)
+                    block = []
+                continue
+            if self.title is None and line.startswith("#"):
+                self.title = line[1:].strip()
+            block.append(line)
+        if block:
+            # an unclosed fence runs to the end of the document
+            yield "\n".join(block)
+
+    def read_metadata(self) -> dict:
+        """
+        Reads the front matter, if the document starts with a --- or +++
+        fence, and nothing past it. A title in it is the page title.
+
+        A leading --- is also a markdown horizontal rule, so without a closing
+        fence or without key: value pairs between the fences it is left to
+        the markdown. A +++ fence is always front matter, its errors are raised.
+        """
+        if self.metadata is not None:
+            return self.metadata
+        self.metadata = {}
+        first = next(self._lines, None)
+        if first is None:
+            return self.metadata
+        fence = first.rstrip("\n").rstrip()
+        if fence not in FENCES:
+            self._lines = chain([first], self._lines)
+            return self.metadata
+        read = []
+        for line in self._lines:
+            read.append(line)
+            if line.rstrip("\n").rstrip() == fence:
+                break
+        else:
+            if FENCES[fence] == "yaml":
+                self._lines = chain([first], read)
+                return self.metadata
+            raise ValueError(f"Front matter has no closing {fence}")
+        lines = [line.rstrip("\n") for line in read[:-1]]
+        try:
+            metadata = parse_front_matter(fence, lines)
+        except ValueError:
+            if FENCES[fence] != "yaml":
+                raise
+            metadata = None
+        if FENCES[fence] == "yaml" and not metadata and any(map(str.strip, lines)):
+            # markdown between two rules, e.g. a heading parsed as a comment
+            self._lines = chain([first], read, self._lines)
+            return self.metadata
+        self.metadata = metadata
+        if self.metadata.get("title"):
+            self.title = str(self.metadata["title"])
+        return self.metadata
+
+    def read_title(self) -> str:
+        """
+        Reads ahead until the title is found, keeping the blocks read on the
+        way for iteration. Usually this is just the front matter or the first
+        block.
+        """
+        self.read_metadata()
+        while self.title is None:
+            block = next(self._blocks, None)
+            if block is None:
+                raise MissingTitleError("No title found")
+            self._buffer.append(block)
+        return self.title
+
+    def __iter__(self) -> Iterator[str]:
+        self.read_metadata()
+        while self._buffer:
+            yield self._buffer.popleft()
+        yield from self._blocks
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[str]:
+    return iter(MarkdownReader(lines))
+
+
+def scan_metadata(path) -> dict:
+    """
+    Reads only the head of a markdown file, never parsing its body: the front
+    matter and, when that has no title, the lines up to the first heading.
+    The result always has a "title", None when the page has none.
+    """
+    with open(path, "r") as f:
+        reader = MarkdownReader(f)
+        metadata = dict(reader.read_metadata())
+        try:
+            metadata["title"] = reader.read_title()
+        except MissingTitleError:
+            metadata["title"] = None
+    return metadata
+
+
+def is_draft(path) -> bool:
+    """
+    Tells whether the front matter of a markdown file sets draft: true.
+    """
+    with open(path, "r") as f:
+        return MarkdownReader(f).read_metadata().get("draft") is True
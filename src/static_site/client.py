@@ -0,0 +1,115 @@
+"""
+Thin client for the render daemon (`static-site daemon`).
+
+Imports nothing but the standard library, so a preview costs a connect and
+a round trip instead of a full interpreter start and renderer import.
+
+    static-site-client build /static_site_boot.dev/ --incremental
+    static-site-client render content/index.md
+    static-site-client stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = ".cache/daemon.sock"
+
+
+def request(payload: dict, socket_path=DEFAULT_SOCKET, timeout=None) -> dict:
+    """
+    Sends one JSON request and returns the daemon's JSON response. The
+    protocol is one JSON object per line in each direction.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(os.fspath(socket_path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("The daemon closed the connection")
+    return json.loads(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="static-site-client", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    commands = parser.add_subparsers(dest="op", required=True)
+    commands.add_parser("ping", help="check that the daemon is up")
+    commands.add_parser("stats", help="print the daemon's cache statistics")
+    commands.add_parser("stop", help="save the caches and stop the daemon")
+
+    render = commands.add_parser("render", help="render one markdown file")
+    render.add_argument("path", help="a page under content/, or - for stdin")
+    render.add_argument("--basepath", default="/")
+    render.add_argument("--template", help="template file instead of the site's")
+
+    build = commands.add_parser("build", help="build the site into docs/")
+    build.add_argument("basepath", nargs="?", default="/")
+    build.add_argument("--incremental", action="store_true")
+    build.add_argument("-j", "--jobs", type=int, default=1)
+    build.add_argument("--drafts", action="store_true")
+    build.add_argument("--compress", action="store_true")
+    build.add_argument("--images", action="store_true")
+    build.add_argument("--no-lazy-images", dest="lazy_images", action="store_false")
+    build.add_argument("--ignore", action="append", default=[])
+    build.add_argument("--listing", action="append", default=[])
+    build.add_argument("--per-page", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def _payload(args) -> dict:
+    if args.op == "render":
+        payload = {"op": "render", "basepath": args.basepath}
+        if args.path == "-":
+            payload["markdown"] = sys.stdin.read()
+        else:
+            payload["path"] = args.path
+        if args.template:
+            with open(args.template, "r") as f:
+                payload["template"] = f.read()
+        return payload
+    if args.op == "build":
+        return {
+            "op": "build",
+            "basepath": args.basepath,
+            "incremental": args.incremental,
+            "jobs": args.jobs,
+            "drafts": args.drafts,
+            "compress": args.compress,
+            "images": args.images,
+            "lazy_images": args.lazy_images,
+            "ignore": args.ignore,
+            "listing": args.listing,
+            "per_page": args.per_page,
+        }
+    return {"op": "shutdown" if args.op == "stop" else args.op}
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        response = request(_payload(args), args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: no daemon listening on {args.socket}", file=sys.stderr)
+        return 1
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    if "html" in response:
+        sys.stdout.write(response["html"])
+    elif "output" in response:
+        sys.stdout.write(response["output"])
+        print(f"Built in {response['seconds']:.3f}s")
+    else:
+        print(json.dumps(response, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,182 @@
+import gzip
+import os
+import re
+from pathlib import Path
+
+from .instrument import log
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = {".html", ".css", ".js", ".mjs", ".svg", ".json", ".xml", ".txt"}
+SIBLINGS = (".gz", ".br")
+
+# content that whitespace matters in, kept exactly as written
+RAW_PATTERN = re.compile(
+    r"<(pre|code|textarea|script|style)\b.*?</\1\s*>", re.DOTALL | re.IGNORECASE
+)
+COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _collapse(html: str) -> str:
+    html = COMMENT_PATTERN.sub("", html)
+    return WHITESPACE_PATTERN.sub(lambda m: "\n" if "\n" in m[0] else " ", html)
+
+
+def minify_html(html: str) -> str:
+    """
+    Drops comments and collapses every run of whitespace to one space or
+    newline, which renders the same. <pre>, <code>, <textarea>, <script> and
+    <style> elements are left alone.
+    """
+    parts = []
+    position = 0
+    for match in RAW_PATTERN.finditer(html):
+        parts.append(_collapse(html[position : match.start()]))
+        parts.append(match[0])
+        position = match.end()
+    parts.append(_collapse(html[position:]))
+    return "".join(parts)
+
+
+def formats() -> tuple[str, ...]:
+    """
+    The sibling suffixes written for every file, .br only with brotli installed.
+    """
+    return SIBLINGS if brotli is not None else SIBLINGS[:1]
+
+
+def _encode(data: bytes, suffix: str) -> bytes:
+    if suffix == ".br":
+        return brotli.compress(data, quality=11)
+    # a fixed mtime keeps the output reproducible
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _current(path: Path, suffixes, mtime_ns: int) -> bool:
+    """
+    Tells whether every sibling of path was written from its current content,
+    which is when the siblings carry the file's mtime.
+    """
+    for suffix in suffixes:
+        try:
+            if os.stat(f"{path}{suffix}").st_mtime_ns != mtime_ns:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def process_file(path, previous=None, minify=True, suffixes=None) -> str:
+    """
+    Minifies an html file in place and writes its compressed siblings.
+
+    previous - the same file in the previous build; when its content is
+    identical its siblings are hard linked instead of compressed again
+
+    Returns "unchanged", "linked" or "compressed".
+    """
+    path = Path(path)
+    suffixes = formats() if suffixes is None else suffixes
+    stat = path.stat()
+    if _current(path, suffixes, stat.st_mtime_ns):
+        return "unchanged"
+    data = path.read_bytes()
+    if minify and path.suffix == ".html":
+        minified = minify_html(data.decode()).encode()
+        if minified != data:
+            # a new file rather than a rewrite, the old one may be hard linked
+            _replace(path, minified)
+            data = minified
+            stat = path.stat()
+    times = (stat.st_atime_ns, stat.st_mtime_ns)
+    if previous is not None and _linkable(Path(previous), data, suffixes):
+        for suffix in suffixes:
+            sibling = Path(f"{path}{suffix}")
+            sibling.unlink(missing_ok=True)
+            os.link(f"{previous}{suffix}", sibling)
+            os.utime(sibling, ns=times)
+        return "linked"
+    for suffix in suffixes:
+        _replace(Path(f"{path}{suffix}"), _encode(data, suffix), times)
+    return "compressed"
+
+
+def _replace(path: Path, data: bytes, times=None):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    if times is not None:
+        os.utime(tmp, ns=times)
+    os.replace(tmp, path)
+
+
+def _linkable(previous: Path, data: bytes, suffixes) -> bool:
+    try:
+        stat = previous.stat()
+        if stat.st_size != len(data) or not _current(
+            previous, suffixes, stat.st_mtime_ns
+        ):
+            return False
+        return previous.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def _process(job) -> str:
+    return process_file(*job)
+
+
+def remove_orphans(root) -> int:
+    """
+    Removes the .gz/.br files whose original is gone.
+    """
+    removed = 0
+    for suffix in SIBLINGS:
+        for sibling in Path(root).rglob(f"*{suffix}"):
+            if not sibling.with_suffix("").exists():
+                sibling.unlink()
+                removed += 1
+    return removed
+
+
+def postprocess(root, previous_root=None, minify=True, workers=1) -> dict:
+    """
+    Minifies the html under root and writes a .gz (and with brotli a .br)
+    sibling next to every compressible file, over a process pool. Files
+    whose siblings are current are skipped, and those identical to their
+    copy in previous_root reuse its siblings.
+    workers - pool size, None or 0 for one worker per core
+    """
+    root = Path(root)
+    removed = remove_orphans(root)
+    suffixes = formats()
+    jobs = []
+    for path in sorted(root.rglob("*")):
+        # hidden files, such as the incremental manifest, aren't served
+        if path.suffix not in COMPRESSIBLE or path.name.startswith("."):
+            continue
+        if path.is_file():
+            previous = None
+            if previous_root is not None:
+                previous = Path(previous_root) / path.relative_to(root)
+            jobs.append((path, previous, minify, suffixes))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        results = [_process(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_process, jobs, chunksize=chunksize))
+    counts = {"compressed": 0, "linked": 0, "unchanged": 0, "removed": removed}
+    for result in results:
+        counts[result] += 1
+    log(
+        f"Compressed {counts['compressed']}, reused {counts['linked']} and kept "
+        f"{counts['unchanged']} of {len(jobs)} files as {'/'.join(suffixes)}"
+    )
+    return counts
@@ -0,0 +1,279 @@
+"""
+A long running render worker. It keeps the imports, the block cache, the
+file and metadata indexes and a warm Renderer in memory, and takes render
+and build jobs over a Unix socket, so a preview costs milliseconds instead
+of a fresh interpreter and a cold build.
+
+The protocol is one JSON object per line each way, see client.py:
+
+    {"op": "render", "path": "content/index.md", "basepath": "/"}
+    {"op": "render", "markdown": "# Hi", "template": "<h1>{{ Title }}</h1>"}
+    {"op": "build", "basepath": "/", "incremental": true, "jobs": 1}
+    {"op": "ping"} {"op": "stats"} {"op": "shutdown"}
+
+Responses are {"ok": true, ...} or {"ok": false, "error": "..."}.
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from .api import Renderer
+from .blockcache import enable_block_cache
+from .client import DEFAULT_SOCKET
+from .discovery import FileIndex
+from .highlight import enable_highlight_cache
+from .layouts import Layouts
+from .listings import Listings
+from .main import build
+from .metadata import MetadataIndex
+
+
+class Daemon:
+    def __init__(
+        self,
+        cache_dir=".cache",
+        block_cache_size=4096,
+        template_path="template.html",
+        content_dir="content",
+    ):
+        """
+        Holds the warm state and runs one request at a time, relative to the
+        current directory like main.py.
+        cache_dir - where the caches are loaded from and saved to on shutdown,
+        None to keep them in memory only
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.template_path = Path(template_path)
+        self.content_dir = Path(content_dir)
+        self.cache = None
+        if block_cache_size:
+            self.cache = enable_block_cache(block_cache_size, self._path("blocks.json"))
+        self.index = FileIndex()
+        self.metadata = MetadataIndex()
+        if self.cache_dir is not None:
+            enable_highlight_cache(self.cache_dir / "highlight")
+            self.index = FileIndex.load(self._path("files.json"))
+            self.metadata = MetadataIndex.load(self._path("metadata.json"))
+        self.renderers: dict[str, Renderer] = {}
+        self.started = time.monotonic()
+        self.requests = 0
+        self.ops = {
+            "ping": self.ping,
+            "stats": self.stats,
+            "render": self.render,
+            "build": self.build,
+            "shutdown": self.ping,
+        }
+
+    def _path(self, name: str) -> Path | None:
+        return self.cache_dir / name if self.cache_dir else None
+
+    def handle(self, request: dict) -> dict:
+        """
+        Runs one request and returns its response. Errors become
+        {"ok": false} responses, they never stop the daemon.
+        """
+        self.requests += 1
+        op = self.ops.get(request.get("op"))
+        try:
+            if op is None:
+                raise ValueError(f"Unknown op: {request.get('op')!r}")
+            return {"ok": True, **op(request)}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def renderer(self, basepath: str) -> Renderer:
+        if basepath not in self.renderers:
+            self.renderers[basepath] = Renderer(basepath=basepath)
+        return self.renderers[basepath]
+
+    def ping(self, request: dict) -> dict:
+        return {"pid": os.getpid(), "uptime": time.monotonic() - self.started}
+
+    def stats(self, request: dict) -> dict:
+        stats = {
+            "requests": self.requests,
+            "renderers": sorted(self.renderers),
+            "files": self.index.stats(),
+            "pages": len(self.metadata.pages),
+        }
+        if self.cache is not None:
+            stats["blocks"] = self.cache.stats()
+        return stats
+
+    def render(self, request: dict) -> dict:
+        """
+        Renders "markdown", or the page at "path" with the template the site
+        would use for it. "template" (source, not a path) overrides that.
+        """
+        renderer = self.renderer(request.get("basepath", "/"))
+        template = request.get("template")
+        if "markdown" in request:
+            markdown = request["markdown"]
+        elif "path" in request:
+            path = Path(request["path"])
+            with open(path, "r") as f:
+                markdown = f.read()
+            if template is None:
+                # a fresh Layouts picks up edited templates, loading stays
+                # cheap as unchanged files are cached by mtime
+                layouts = Layouts(self.template_path, self.content_dir)
+                template = layouts.load(layouts.template_for(path))
+        else:
+            raise ValueError("A render request needs markdown or a path")
+        html = renderer.render(
+            markdown, template=template, context=request.get("context")
+        )
+        return {"html": html}
+
+    def build(self, request: dict) -> dict:
+        """
+        Builds the site like main.py, reusing the warm caches. The build's
+        output is returned instead of printed.
+        """
+        listing = request.get("listing") or ()
+        drafts = request.get("drafts", False)
+        images = None
+        if request.get("images"):
+            from .images import DEFAULT_WIDTHS, ResponsiveImages
+
+            images = ResponsiveImages(
+                self._path("images"),
+                request.get("image_widths") or DEFAULT_WIDTHS,
+                request.get("lazy_images", True),
+            )
+        output = io.StringIO()
+        start = time.perf_counter()
+        with redirect_stdout(output):
+            build(
+                "static",
+                "docs",
+                request.get("basepath", "/"),
+                request.get("incremental", False),
+                request.get("jobs", 1),
+                ignore=tuple(request.get("ignore") or ()),
+                index=self.index,
+                drafts=drafts,
+                listings=(
+                    Listings(listing, request.get("per_page", 10), drafts)
+                    if listing
+                    else None
+                ),
+                metadata=self.metadata,
+                compress=request.get("compress", False),
+                minify=request.get("minify", True),
+                images=images,
+            )
+        if images is not None:
+            images.save()
+        return {"output": output.getvalue(), "seconds": time.perf_counter() - start}
+
+    def save(self):
+        if self.cache_dir is None:
+            return
+        self.index.save(self._path("files.json"))
+        self.metadata.save(self._path("metadata.json"))
+        if self.cache is not None:
+            self.cache.save(self._path("blocks.json"))
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be a JSON object")
+            except ValueError as e:
+                request = {}
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                response = self.server.daemon.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if request.get("op") == "shutdown":
+                # shutdown() waits for serve_forever, which waits for us
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Serves one connection at a time, so requests never run concurrently
+    against the shared caches.
+    """
+
+    def __init__(self, socket_path, daemon: Daemon):
+        self.daemon = daemon
+        super().__init__(os.fspath(socket_path), RequestHandler)
+
+
+def _claim(socket_path: Path):
+    """
+    Removes a socket file left behind by a daemon that is gone, and refuses
+    to start next to one that is still running.
+    """
+    if not socket_path.exists():
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(os.fspath(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            socket_path.unlink(missing_ok=True)
+            return
+    raise ValueError(f"A daemon is already listening on {socket_path}")
+
+
+def run(socket_path=DEFAULT_SOCKET, daemon: Daemon | None = None):
+    socket_path = Path(socket_path)
+    _claim(socket_path)
+    daemon = daemon or Daemon()
+    with DaemonServer(socket_path, daemon) as server:
+        print(f"Daemon listening on {socket_path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+            daemon.save()
+    print("Daemon stopped, caches saved")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="static-site daemon",
+        description="Keep the renderer and caches warm and take render and "
+        "build jobs over a Unix socket",
+        epilog="Send jobs with `static-site-client`, e.g. "
+        "`static-site-client build --incremental`.",
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--cache-dir", default=".cache")
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="don't read or write caches on disk",
+    )
+    parser.add_argument("--block-cache-size", type=int, default=4096, metavar="N")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run(args.socket, Daemon(args.cache_dir, args.block_cache_size))
@@ -0,0 +1,35 @@
+class DependencyGraph:
+    def __init__(self, pages: dict[str, list[str]] | None = None):
+        """
+        pages - maps an output page, relative to the output dir, to the files
+        it was built from: its markdown source, its template and partials
+        """
+        self.pages: dict[str, list[str]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        for output, dependencies in (pages or {}).items():
+            self.record(output, dependencies)
+
+    def record(self, output: str, dependencies):
+        self.forget(output)
+        self.pages[output] = list(dependencies)
+        for dependency in self.pages[output]:
+            self._dependents.setdefault(dependency, set()).add(output)
+
+    def forget(self, output: str):
+        for dependency in self.pages.pop(output, ()):
+            outputs = self._dependents[dependency]
+            outputs.discard(output)
+            if not outputs:
+                del self._dependents[dependency]
+
+    def dependencies(self, output: str) -> list[str] | None:
+        return self.pages.get(output)
+
+    def dependents(self, paths) -> set[str]:
+        """
+        Returns the output pages built from any of paths.
+        """
+        outputs = set()
+        for path in paths:
+            outputs |= self._dependents.get(path, set())
+        return outputs
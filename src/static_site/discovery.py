@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+INDEX_VERSION = 1
+# a listing is only reused when its directory was last modified at least this
+# long before the scan, so coarse mtimes can't hide a change made just after it
+MTIME_SLACK_NS = 2_000_000_000
+
+
+def is_ignored(rel: str, patterns) -> bool:
+    """
+    rel - a path relative to the scanned root, in posix form
+    patterns - globs matched against the entry name and against rel, e.g.
+    "drafts", "_*" or "blog/*.draft.md"
+    """
+    name = rel.rpartition("/")[2]
+    return any(fnmatchcase(name, p) or fnmatchcase(rel, p) for p in patterns)
+
+
+class FileIndex:
+    def __init__(self):
+        """
+        dirs - maps a directory, relative to the root, to (mtime_ns, inode,
+        entries), where entries lists (name, is_dir) in name order. A file
+        edited in place doesn't touch its directory, so the listings say which
+        files exist, never whether one changed.
+        """
+        self.dirs: dict[str, tuple[int, int, list[tuple[str, bool]]]] = {}
+        self.scanned = 0
+        self.reused = 0
+
+    @classmethod
+    def load(cls, path) -> "FileIndex":
+        """
+        Loads an index saved by an earlier build, or an empty one when the
+        file is missing, unreadable or from another version.
+        """
+        index = cls()
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get("version") != INDEX_VERSION:
+            return index
+        for rel, (mtime_ns, inode, entries) in data.get("dirs", {}).items():
+            index.dirs[rel] = (mtime_ns, inode, [tuple(e) for e in entries])
+        return index
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "dirs": self.dirs}, f)
+        os.replace(tmp, path)
+
+    def listing(self, root: Path, rel: str) -> list[tuple[str, bool]]:
+        """
+        Returns the entries of the directory root/rel. Costs one stat when the
+        directory is unchanged since it was indexed, a scandir otherwise.
+        """
+        path = os.path.join(root, rel) if rel else os.fspath(root)
+        stat = os.stat(path)
+        cached = self.dirs.get(rel)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_ino):
+            self.reused += 1
+            return cached[2]
+        self.scanned += 1
+        with os.scandir(path) as it:
+            entries = sorted((entry.name, entry.is_dir()) for entry in it)
+        if stat.st_mtime_ns + MTIME_SLACK_NS < time.time_ns():
+            self.dirs[rel] = (stat.st_mtime_ns, stat.st_ino, entries)
+        else:
+            self.dirs.pop(rel, None)
+        return entries
+
+    def retain(self, dirs: set[str]):
+        """
+        Forgets every directory not in dirs, e.g. the ones that were removed
+        since the index was saved.
+        """
+        self.dirs = {rel: record for rel, record in self.dirs.items() if rel in dirs}
+
+    def stats(self) -> str:
+        total = self.scanned + self.reused
+        return f"File index: reused {self.reused}/{total} directory listings"
+
+
+def discover(root, suffix=None, ignore=(), index: FileIndex | None = None) -> list[str]:
+    """
+    Returns the files under root, relative to it in posix form, depth first
+    in name order (the order collect_page_jobs has always used).
+
+    suffix - only files ending with it, e.g. ".md"
+    ignore - globs for files and directories to leave out, see is_ignored
+    index - reuses the listings of unchanged directories and records new ones
+    """
+    root = Path(root)
+    index = index if index is not None else FileIndex()
+    found = []
+    seen = set()
+    stack = [iter([("", True)])]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        rel, is_dir = entry
+        if rel and is_ignored(rel, ignore):
+            continue
+        if is_dir:
+            seen.add(rel)
+            prefix = f"{rel}/" if rel else ""
+            children = [
+                (prefix + name, child_is_dir)
+                for name, child_is_dir in index.listing(root, rel)
+            ]
+            stack.append(iter(children))
+        elif suffix is None or rel.endswith(suffix):
+            found.append(rel)
+    index.retain(seen)
+    return found
@@ -0,0 +1,80 @@
+import re
+
+# the line that opens and closes front matter, and its format
+FENCES = {"---": "yaml", "+++": "toml"}
+
+YAML_KEY = re.compile(r"^([\w-]+)\s*:(.*)$")
+
+
+def _scalar(value: str):
+    """
+    Converts a YAML style scalar: quoted strings, true/false, integers,
+    [a, b] lists, and anything else as a plain string (dates stay strings).
+    """
+    value = value.strip()
+    if not value:
+        return ""
+    if value[0] == value[-1] and value[0] in "\"'" and len(value) > 1:
+        return value[1:-1]
+    if value.startswith("[") and value.endswith("]"):
+        return [_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    return value
+
+
+def _parse_yaml(lines: list[str]) -> dict:
+    """
+    Parses the flat subset of YAML front matter uses: key: value pairs,
+    inline [a, b] lists and block lists of "- item" lines.
+    """
+    meta = {}
+    key = None
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        stripped = line.strip()
+        if stripped.startswith("- ") and key is not None:
+            if not isinstance(meta[key], list):
+                meta[key] = []
+            meta[key].append(_scalar(stripped[2:]))
+            continue
+        match = YAML_KEY.match(line)
+        if match is None:
+            raise ValueError(f"Invalid front matter line {number}: {line!r}")
+        key = match[1]
+        meta[key] = _scalar(match[2])
+    return meta
+
+
+def parse_front_matter(fence: str, lines: list[str]) -> dict:
+    """
+    Parses the lines between the fences into a dict.
+    fence - "---" for YAML style front matter, "+++" for TOML
+    """
+    if FENCES[fence] == "toml":
+        # few sites use TOML, the others don't pay for importing it
+        import tomllib
+
+        try:
+            return tomllib.loads("\n".join(lines))
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid front matter: {e}") from None
+    return _parse_yaml(lines)
+
+
+def as_context(meta: dict) -> dict:
+    """
+    Turns metadata into template values: lists are joined with ", " and
+    booleans written in lower case, like they were in the front matter.
+    """
+    context = {}
+    for key, value in meta.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        context[key] = value
+    return context
@@ -0,0 +1,432 @@
+import io
+from pathlib import Path
+
+from .textnode import TextType, TextNode
+from .htmlnode import LeafNode, ParentNode
+from .blocks import BlockType
+from .inline import IMAGE_RE, LINK_RE, tokenize_inline, tokenize_nodes
+from .template import Template
+from .layouts import Layouts
+from .instrument import log, page, profiler, stage
+from .blockcache import block_cache
+from .highlight import highlight_cached
+from .blockstream import MarkdownReader, is_draft, iter_blocks
+from .discovery import FileIndex, discover
+from .frontmatter import as_context
+from .metadata import MetadataIndex
+
+
+def rebase_url(url: str | None, basepath: str = "/") -> str | None:
+    """
+    Prefixes a root relative url (e.g. "/images/a.png") with basepath.
+    """
+    if basepath == "/" or not url or not url.startswith("/") or url.startswith("//"):
+        return url
+    return basepath + url[1:]
+
+
+def text_node_to_html_node(text_node: TextNode | None, basepath: str = "/") -> LeafNode:
+    assert text_node is not None, "Text node cannot be None"
+    match text_node.text_type:
+        case TextType.TEXT:
+            return LeafNode(None, text_node.text.replace("\n", " "))
+        case TextType.BOLD:
+            return LeafNode("b", text_node.text)
+        case TextType.ITALIC:
+            return LeafNode("i", text_node.text)
+        case TextType.CODE:
+            return LeafNode("code", text_node.text)
+        case TextType.LINK:
+            return LeafNode(
+                "a", text_node.text, {"href": rebase_url(text_node.url, basepath)}
+            )
+        case TextType.IMAGE:
+            return LeafNode(
+                "img",
+                None,
+                {"src": rebase_url(text_node.url, basepath), "alt": text_node.text},
+            )
+        case _:
+            raise Exception("Unsupported text node type")
+
+
+def split_nodes_delimiter(
+    old_nodes: list[TextNode], delimiter: str, text_type: TextType
+):
+    return tokenize_nodes(
+        old_nodes, ((delimiter, text_type),), images=False, links=False
+    )
+
+
+def extract_markdown_images(text):
+    return IMAGE_RE.findall(text)
+
+
+def extract_markdown_links(text):
+    return LINK_RE.findall(text)
+
+
+def split_nodes_image(old_nodes):
+    return tokenize_nodes(old_nodes, (), images=True, links=False)
+
+
+def split_nodes_link(old_nodes):
+    return tokenize_nodes(old_nodes, (), images=False, links=True)
+
+
+def text_to_textnodes(text: str) -> list[TextNode]:
+    return tokenize_inline(text)
+
+
+def markdown_to_blocks(markdown: str) -> list[str]:
+    return list(iter_blocks(markdown.split("\n")))
+
+
+# first character of a block -> (prefix, type) candidates, checked in order
+BLOCK_PREFIXES = {
+    "#": (("#", BlockType.HEADING),),
+    "`": (("```", BlockType.CODE),),
+    ">": ((">", BlockType.QUOTE),),
+    "-": (("-", BlockType.UNORDERED_LIST),),
+    "1": (("1.", BlockType.ORDERED_LIST),),
+}
+
+
+def block_to_block_type(block):
+    for prefix, block_type in BLOCK_PREFIXES.get(block[:1], ()):
+        if block.startswith(prefix):
+            return block_type
+    return BlockType.PARAGRAPH
+
+
+def text_to_children(text, basepath="/"):
+    with stage("inline"):
+        return [text_node_to_html_node(tn, basepath) for tn in text_to_textnodes(text)]
+
+
+# def markdown_to_html_node(markdown):
+#     blocks = markdown_to_blocks(markdown)
+#     children = []
+#     for block in blocks:
+#         block_type = block_to_block_type(block)
+#         match block_type:
+#             case BlockType.HEADING:
+#                 level = len(block.split(" ")[0])
+#                 children.append(
+#                     ParentNode(
+#                         f"h{level}",
+#                         children=text_to_children(block.lstrip("# ").strip()),
+#                     )
+#                 )
+#             case BlockType.CODE:
+#                 code_content = block.strip("`").lstrip("\n")
+#                 code_html_node = LeafNode(None, code_content)
+#                 children.append(
+#                     ParentNode("pre", children=[ParentNode("code", children=[code_html_node])])
+#                 )
+#             case BlockType.QUOTE:
+#                 children.append(
+#                     ParentNode("blockquote", children=text_to_children(block.strip("> ").strip()))
+#                 )
+#             case BlockType.UNORDERED_LIST:
+#                 children.append(ParentNode("ul", children=text_to_children(block)))
+#             case BlockType.ORDERED_LIST:
+#                 children.append(ParentNode("ol", children=text_to_children(block)))
+#             case BlockType.PARAGRAPH:
+#                 children.append(ParentNode("p", children=text_to_children(block)))
+#             case _:
+#                 raise ValueError(f"Unknown block type: {block_type}")
+#     return ParentNode("div", children=children)
+def parse_list_items(block, list_marker, basepath="/"):
+    """
+    Parses a block of markdown list text into a list of ParentNodes (for <li>).
+
+    Args:
+        block: The markdown string representing the list.
+        list_marker: The marker for unordered lists (e.g., "- ") or None for ordered lists.
+        basepath: Prefix for root relative link and image urls.
+
+    Returns:
+        A list of ParentNodes, where each node represents an <li> element.
+    """
+    items = []
+    lines = block.split("\n")
+    for line in lines:
+        if list_marker is not None:
+            if line.startswith(list_marker):
+                item_content = line.lstrip(list_marker).strip()
+                items.append(
+                    ParentNode("li", children=text_to_children(item_content, basepath))
+                )
+        else:  # Ordered list
+            # For ordered lists, we need to strip the number and space, e.g., "1. "
+            parts = line.split(". ", 1)
+            if len(parts) == 2:
+                item_content = parts[1].strip()
+                items.append(
+                    ParentNode("li", children=text_to_children(item_content, basepath))
+                )
+            elif (
+                line.strip()
+            ):  # Handle cases where the line might just be text after a number
+                items.append(
+                    ParentNode("li", children=text_to_children(line.strip(), basepath))
+                )
+    return items
+
+
+def parse_code_block(block: str) -> tuple[str, str]:
+    """
+    Splits a fenced code block into its language tag ("" when there is none)
+    and its code: "```py\nx = 1\n```" -> ("py", "x = 1\n").
+    """
+    inner = block.strip("`")
+    info, newline, code = inner.partition("\n")
+    if not newline:
+        return "", inner
+    words = info.split()
+    language = words[0] if words else ""
+    # it ends up in a class attribute
+    if not all(c.isalnum() or c in "+#._-" for c in language):
+        language = ""
+    return language, code
+
+
+def block_to_html_node(block, block_type, basepath="/", highlighter=highlight_cached):
+    """
+    highlighter - turns (code, language) into the html of a code block
+    """
+    match block_type:
+        case BlockType.HEADING:
+            level = len(block.split(" ")[0])
+            return ParentNode(
+                f"h{level}",
+                children=text_to_children(block.lstrip("# ").strip(), basepath),
+            )
+        case BlockType.CODE:
+            language, code_content = parse_code_block(block)
+            code_html_node = LeafNode(None, highlighter(code_content, language))
+            props = {"class": f"language-{language}"} if language else None
+            return ParentNode(
+                "pre", children=[ParentNode("code", [code_html_node], props)]
+            )
+        case BlockType.QUOTE:
+            lines = block.split("\n")
+            cleaned_lines = [line.lstrip("> ").strip() for line in lines]
+            cleaned_block = " ".join(cleaned_lines)
+            return ParentNode(
+                "blockquote", children=text_to_children(cleaned_block, basepath)
+            )
+        case BlockType.UNORDERED_LIST:
+            # Correctly parse list items
+            list_items = parse_list_items(block, "- ", basepath)
+            return ParentNode("ul", children=list_items)
+        case BlockType.ORDERED_LIST:
+            # Correctly parse list items
+            list_items = parse_list_items(
+                block, None, basepath
+            )  # Use None for ordered list, as numbers are part of the content
+            return ParentNode("ol", children=list_items)
+        case BlockType.PARAGRAPH:
+            return ParentNode("p", children=text_to_children(block, basepath))
+        case _:
+            raise ValueError(f"Unknown block type: {block_type}")
+
+
+# use whatever enable_block_cache set up
+_GLOBAL_CACHE = object()
+
+
+def iter_block_nodes(
+    blocks, basepath="/", cache=_GLOBAL_CACHE, highlighter=highlight_cached
+):
+    """
+    cache - a BlockCache of its own, or None to render every block
+    highlighter - see block_to_html_node
+    """
+    if cache is _GLOBAL_CACHE:
+        cache = block_cache()
+    for block in blocks:
+        with stage("block_type"):
+            block_type = block_to_block_type(block)
+        if cache is None:
+            with stage("tree"):
+                node = block_to_html_node(block, block_type, basepath, highlighter)
+            yield node
+            continue
+        # cached blocks come back as their rendered html in a raw LeafNode
+        key = cache.key(block, block_type, basepath)
+        html = cache.get(key)
+        if html is None:
+            with stage("tree"):
+                node = block_to_html_node(block, block_type, basepath, highlighter)
+            with stage("serialize"):
+                html = node.to_html()
+            cache.put(key, html)
+        yield LeafNode(None, html)
+
+
+def markdown_to_html_node(markdown, basepath="/"):
+    with stage("blocks"):
+        blocks = markdown_to_blocks(markdown)
+    children = list(iter_block_nodes(blocks, basepath))
+    return ParentNode("div", children=children)  # Assuming a root div, adjust as needed
+
+
+class StreamedContent:
+    def __init__(
+        self,
+        reader: MarkdownReader,
+        basepath="/",
+        cache=_GLOBAL_CACHE,
+        highlighter=highlight_cached,
+    ):
+        """
+        The page's root <div>, built block by block while the html is written
+        instead of as a whole tree up front. It can be rendered only once.
+        cache, highlighter - see iter_block_nodes
+        """
+        self.reader = reader
+        self.basepath = basepath
+        self.cache = cache
+        self.highlighter = highlighter
+
+    def _blocks(self):
+        blocks = iter(self.reader)
+        while True:
+            with stage("blocks"):
+                block = next(blocks, None)
+            if block is None:
+                return
+            yield block
+
+    def iter_html(self):
+        yield "<div>"
+        nodes = iter_block_nodes(
+            self._blocks(), self.basepath, self.cache, self.highlighter
+        )
+        for node in nodes:
+            yield from node.iter_html()
+        yield "</div>"
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+
+def extract_title(markdown):
+    """
+    Extracts the title from a markdown string: the front matter title, or
+    else the first heading.
+    """
+    return MarkdownReader.from_string(markdown).read_title()
+
+
+def stream_page(markdown: str | MarkdownReader, template: Template | str, basepath, fp):
+    """
+    Writes the rendered page into fp. The markdown is split into blocks and
+    each block is rendered and written before the next one is read, so
+    neither the document nor the page html is held in memory as a whole.
+    """
+    if isinstance(template, str):
+        template = Template(template)
+    template = template.with_basepath(basepath)
+    reader = (
+        MarkdownReader.from_string(markdown) if isinstance(markdown, str) else markdown
+    )
+    with stage("blocks"):
+        title = reader.read_title()
+    context = {
+        **as_context(reader.metadata),
+        "Title": title,
+        "Content": StreamedContent(reader, basepath),
+    }
+    if profiler() is None:
+        template.write(context, fp)
+        return
+    # when profiling, split the streamed write into its stages
+    with stage("serialize"):
+        context["Content"] = context["Content"].to_html()
+    with stage("template"):
+        html = template.render(context)
+    with stage("write"):
+        fp.write(html)
+
+
+def render_page(markdown, template, basepath):
+    """
+    Renders a markdown document into the template and returns the page html.
+    """
+    buffer = io.StringIO()
+    stream_page(markdown, template, basepath, buffer)
+    return buffer.getvalue()
+
+
+def write_page(from_path, template, dest_path, basepath):
+    with stage("read"):
+        source = open(from_path, "r")
+    Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with source, open(dest_path, "w") as f:
+            stream_page(MarkdownReader(source), template, basepath, f)
+    except Exception:
+        # don't leave a half written page behind
+        Path(dest_path).unlink(missing_ok=True)
+        raise
+
+
+def generate_page(from_path, template_path, dest_path, basepath):
+    generate_pages([(from_path, dest_path)], template_path, basepath)
+
+
+def collect_page_jobs(
+    dir_path: Path,
+    dest_dir_path: Path,
+    ignore=(),
+    index: FileIndex | None = None,
+    drafts=True,
+    metadata: MetadataIndex | None = None,
+) -> list[tuple[Path, Path]]:
+    """
+    Collects every (markdown source, html destination) pair under dir_path,
+    depth first in name order.
+    ignore - globs for files and directories to skip, e.g. "drafts" or "_*"
+    index - a FileIndex of dir_path, to skip listing unchanged directories
+    drafts - False to skip pages whose front matter sets draft: true
+    metadata - a MetadataIndex brought up to date with the pages found
+    """
+    dir_path, dest_dir_path = Path(dir_path), Path(dest_dir_path)
+    rels = discover(dir_path, ".md", ignore, index)
+    if metadata is not None:
+        metadata.update(dir_path, rels)
+    jobs = []
+    for rel in rels:
+        if not drafts and (
+            metadata.is_draft(rel) if metadata is not None else is_draft(dir_path / rel)
+        ):
+            continue
+        jobs.append((dir_path / rel, (dest_dir_path / rel).with_suffix(".html")))
+    return jobs
+
+
+def generate_pages(
+    jobs: list[tuple[Path, Path]], template_path: str | Layouts, basepath: str
+):
+    """
+    template_path - the default template, or Layouts to pick each page's own
+    """
+    layouts = Layouts.of(template_path)
+    for from_path, dest_path in jobs:
+        page_template = layouts.template_for(from_path)
+        log(f"Generating page from {from_path} to {dest_path} using {page_template}")
+        with page(from_path):
+            write_page(from_path, layouts.load(page_template), dest_path, basepath)
+
+
+def generate_pages_recursive(
+    dir_path: Path, template_path: str | Layouts, dest_dir_path: Path, basepath: str
+):
+    generate_pages(
+        collect_page_jobs(dir_path, dest_dir_path),
+        Layouts.of(template_path, dir_path),
+        basepath,
+    )
@@ -0,0 +1,261 @@
+import hashlib
+import os
+import re
+from functools import cache
+from html import escape
+from pathlib import Path
+from typing import NamedTuple
+
+# the token classes are Pygments' short names, so its stylesheets apply
+STRING = r""""(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'"""
+NUMBER = r"\b(?:0[xob][\da-fA-F_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)\b"
+C_COMMENT = r"//[^\n]*|/\*[\s\S]*?\*/"
+
+
+def _words(words: str) -> str:
+    return r"\b(?:" + "|".join(words.split()) + r")\b"
+
+
+# language -> (token class, pattern) pairs, earlier ones win at a position
+RULES: dict[str, tuple[tuple[str, str], ...]] = {
+    "python": (
+        ("c", r"#[^\n]*"),
+        ("s", r"""[rRbBfFuU]{0,2}(?:\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?''')"""),
+        ("s", rf"[rRbBfFuU]{{0,2}}(?:{STRING})"),
+        ("nd", r"@[\w.]+"),
+        (
+            "k",
+            _words(
+                "and as assert async await break class continue def del elif else "
+                "except finally for from global if import in is lambda nonlocal "
+                "not or pass raise return try while with yield match case"
+            ),
+        ),
+        ("kc", _words("True False None")),
+        (
+            "nb",
+            _words(
+                "print len range open str int float list dict set tuple bool "
+                "isinstance super self"
+            ),
+        ),
+        ("m", NUMBER),
+    ),
+    "javascript": (
+        ("c", C_COMMENT),
+        ("s", rf"{STRING}|`(?:\\.|[^`\\])*`"),
+        (
+            "k",
+            _words(
+                "async await break case catch class const continue default delete "
+                "do else export extends finally for from function if import in "
+                "instanceof interface let new of return static switch this throw "
+                "try type typeof var void while yield"
+            ),
+        ),
+        ("kc", _words("true false null undefined NaN")),
+        ("nb", _words("console document window JSON Math Promise")),
+        ("m", NUMBER),
+    ),
+    "go": (
+        ("c", C_COMMENT),
+        ("s", rf"{STRING}|`[^`]*`"),
+        (
+            "k",
+            _words(
+                "break case chan const continue default defer else fallthrough "
+                "for func go goto if import interface map package range return "
+                "select struct switch type var"
+            ),
+        ),
+        ("kc", _words("true false nil iota")),
+        ("nb", _words("append cap len make new panic error")),
+        ("m", NUMBER),
+    ),
+    "bash": (
+        ("c", r"(?<![\w$])#[^\n]*"),
+        ("s", STRING),
+        ("nv", r"\$(?:\{[^}\n]*\}|\w+|[@#?$!*-])"),
+        (
+            "k",
+            _words(
+                "if then else elif fi for in do done while until case esac "
+                "function return local export"
+            ),
+        ),
+        ("nb", _words("cd echo exit printf read set source")),
+    ),
+    "json": (
+        ("nt", r'"(?:\\.|[^"\\\n])*"(?=\s*:)'),
+        ("s", r'"(?:\\.|[^"\\\n])*"'),
+        ("kc", _words("true false null")),
+        ("m", r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?"),
+    ),
+    "css": (
+        ("c", r"/\*[\s\S]*?\*/"),
+        ("s", STRING),
+        ("nt", r"[\w-]+(?=\s*:[^;{}]*[;}])"),
+        ("m", r"#[\da-fA-F]{3,8}\b|-?\d+(?:\.\d+)?(?:%|[a-z]+)?"),
+        ("k", r"@[\w-]+|!important"),
+    ),
+    "html": (
+        ("c", r"<!--[\s\S]*?-->"),
+        ("nt", r"</?[\w:-]+|/?>"),
+        ("na", r"[\w:-]+(?==)"),
+        ("s", STRING),
+    ),
+}
+
+ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "jsx": "javascript",
+    "ts": "javascript",
+    "tsx": "javascript",
+    "typescript": "javascript",
+    "golang": "go",
+    "sh": "bash",
+    "shell": "bash",
+    "zsh": "bash",
+    "xml": "html",
+    "svg": "html",
+}
+
+
+class Lexer(NamedTuple):
+    pattern: re.Pattern
+    # maps the group of each alternative to its token class
+    classes: dict[str, str]
+
+
+@cache
+def compile_lexer(language: str) -> Lexer | None:
+    """
+    Compiles the rules of language (or an alias) into one alternation, so a
+    single finditer walk tokenizes the code. None for unknown languages.
+    """
+    if language in ALIASES:
+        return compile_lexer(ALIASES[language])
+    rules = RULES.get(language)
+    if rules is None:
+        return None
+    alternatives = []
+    classes = {}
+    for index, (token_class, pattern) in enumerate(rules):
+        alternatives.append(f"(?P<t{index}>{pattern})")
+        classes[f"t{index}"] = token_class
+    return Lexer(re.compile("|".join(alternatives)), classes)
+
+
+def highlight(code: str, language: str = "") -> str:
+    """
+    Returns code as escaped html, its tokens wrapped in <span class="...">
+    when the language is known.
+    """
+    lexer = compile_lexer(language.lower()) if language else None
+    if lexer is None:
+        return escape(code, quote=False)
+    parts = []
+    position = 0
+    for match in lexer.pattern.finditer(code):
+        parts.append(escape(code[position : match.start()], quote=False))
+        token_class = lexer.classes[match.lastgroup]
+        parts.append(
+            f'<span class="{token_class}">{escape(match[0], quote=False)}</span>'
+        )
+        position = match.end()
+    parts.append(escape(code[position:], quote=False))
+    return "".join(parts)
+
+
+@cache
+def lexer_version() -> str:
+    # editing the rules invalidates what the cache holds
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+class HighlightCache:
+    def __init__(self, directory):
+        """
+        Highlighted code on disk, one file per distinct (language, code) named
+        by its hash, so unchanged samples are never lexed again by any build.
+        Worker processes can share a directory, writes are atomic.
+        """
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(code: str, language: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{lexer_version()}\0{language}\0".encode())
+        digest.update(code.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key[2:]}.html"
+
+    def get(self, key: str) -> str | None:
+        try:
+            html = self._path(key).read_text()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+
+    def put(self, key: str, html: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(html)
+        os.replace(tmp, path)
+
+    def take_stats(self) -> tuple[int, int]:
+        """
+        Returns and resets the counters, for a worker to send to the parent.
+        """
+        stats = self.hits, self.misses
+        self.hits, self.misses = 0, 0
+        return stats
+
+    def merge(self, hits: int, misses: int):
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self) -> str:
+        return f"Highlight cache: {self.hits} hits, {self.misses} code blocks lexed"
+
+
+_cache: HighlightCache | None = None
+
+
+def enable_highlight_cache(directory) -> HighlightCache:
+    global _cache
+    _cache = HighlightCache(directory)
+    return _cache
+
+
+def disable_highlight_cache():
+    global _cache
+    _cache = None
+
+
+def highlight_cache() -> HighlightCache | None:
+    return _cache
+
+
+def highlight_cached(code: str, language: str = "") -> str:
+    """
+    highlight() through the cache enable_highlight_cache set up, if any.
+    """
+    language = language.lower()
+    if _cache is None or compile_lexer(language) is None:
+        return highlight(code, language)
+    key = _cache.key(code, language)
+    html = _cache.get(key)
+    if html is None:
+        html = highlight(code, language)
+        _cache.put(key, html)
+    return html
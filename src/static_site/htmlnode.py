@@ -1,4 +1,13 @@
+from types import MappingProxyType
+
+# shared, immutable stand-ins so leaves don't allocate their own containers
+NO_CHILDREN = ()
+NO_PROPS = MappingProxyType({})
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
         self,
         tag: str | None = None,
@@ -15,12 +24,32 @@ class HTMLNode:
         """
         self.tag = tag
         self.value = value
-        self.children = children or []
-        self.props = props or {}
+        self.children = children or NO_CHILDREN
+        self.props = props or NO_PROPS
+
+    def __getstate__(self):
+        # the shared sentinels aren't picklable, so send plain containers
+        return self.tag, self.value, list(self.children), dict(self.props)
+
+    def __setstate__(self, state):
+        tag, value, children, props = state
+        HTMLNode.__init__(self, tag, value, children, props)
 
     def to_html(self):
         raise NotImplementedError
 
+    def iter_html(self):
+        """
+        Yields the html of this node in chunks instead of one string.
+        """
+        yield self.to_html()
+
+    def write_html(self, fp):
+        """
+        Streams the html of this node into a writable text file or buffer.
+        """
+        fp.writelines(self.iter_html())
+
     def props_to_html(self):
         return " ".join([f'{key}="{value}"' for key, value in self.props.items()])
 
@@ -29,6 +58,8 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str | None, value: str | None, props: dict | None = None):
         super().__init__(tag, value, props=props)
 
@@ -47,21 +78,25 @@ class LeafNode(HTMLNode):
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
         self, tag: str | None, children: list | None, props: dict | None = None
     ):
         super().__init__(tag, None, children=children, props=props)
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
         if not self.tag:
             raise ValueError("ParentNode must have a tag")
         if not self.children:
             raise ValueError("ParentNode must have children")
         if self.props:
-            main = f"<{self.tag} {self.props_to_html()}>"
+            yield f"<{self.tag} {self.props_to_html()}>"
         else:
-            main = f"<{self.tag}>"
+            yield f"<{self.tag}>"
         for child in self.children:
-            main += child.to_html()
-        main += f"</{self.tag}>"
-        return main
+            yield from child.iter_html()
+        yield f"</{self.tag}>"
@@ -0,0 +1,361 @@
+import json
+import os
+import re
+import struct
+from html import escape, unescape
+from pathlib import Path
+from typing import NamedTuple
+
+from .assets import hash_file, link_or_copy
+from .instrument import log
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+# gifs keep their animation only at full size
+RESIZABLE = {".png", ".jpg", ".jpeg", ".webp"}
+DEFAULT_WIDTHS = (480, 960, 1600)
+IMAGES_VERSION = 2
+
+IMG_TAG = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+ATTRIBUTE = re.compile(
+    r"""([^\s"'<>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+)))?"""
+)
+# variants are written next to their image as <name>-<width>w.<ext>
+VARIANT_STEM = re.compile(r"-\d+w$")
+# marks the tags process() wrote, so their attributes are updated on the next
+# build while ones sized by hand are left alone
+MARKER = "data-responsive"
+SIZING = ("width", "height", "srcset", "sizes")
+MANAGED = (*SIZING, "loading", "decoding", MARKER)
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        kind = marker[1]
+        if kind == 0xFF:
+            # padding before the marker
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        if kind in (0xD8, 0x01) or 0xD0 <= kind <= 0xD7:
+            continue
+        (length,) = struct.unpack(">H", f.read(2))
+        if 0xC0 <= kind <= 0xCF and kind not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path) -> tuple[int, int] | None:
+    """
+    Reads (width, height) from the header of a PNG, GIF, WebP or JPEG file,
+    None when the format isn't recognized.
+    """
+    with open(path, "rb") as f:
+        head = f.read(30)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) == 30:
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                (bits,) = struct.unpack("<I", head[21:25])
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                width = int.from_bytes(head[24:27], "little") + 1
+                return width, int.from_bytes(head[27:30], "little") + 1
+        if head[:2] == b"\xff\xd8":
+            f.seek(2)
+            try:
+                return _jpeg_size(f)
+            except struct.error:
+                return None
+    return None
+
+
+class ImageInfo(NamedTuple):
+    digest: str
+    width: int
+    height: int
+
+
+def _resize(job) -> Path:
+    source, destination, width = job
+    with Image.open(source) as image:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+        resized.save(tmp, format=image.format)
+    os.replace(tmp, destination)
+    return destination
+
+
+def _resolve(src: str, page: Path, root: Path, basepath: str) -> str | None:
+    """
+    The path relative to root of the file an <img src> points at, None for
+    external and data urls.
+    """
+    src = src.split("#", 1)[0].split("?", 1)[0]
+    if not src or "://" in src or src.startswith(("//", "data:")):
+        return None
+    prefix = basepath if basepath.endswith("/") else f"{basepath}/"
+    if src.startswith(prefix):
+        rel = src[len(prefix) :]
+    elif src.startswith("/"):
+        rel = src[1:]
+    else:
+        rel = os.path.relpath(page.parent / src, root)
+    return Path(os.path.normpath(rel)).as_posix()
+
+
+def _newer(path: Path, than: Path) -> bool:
+    try:
+        return path.stat().st_mtime_ns >= than.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+class ResponsiveImages:
+    def __init__(self, cache_dir=None, widths=DEFAULT_WIDTHS, lazy=True):
+        """
+        Gives every <img> of the built site its width and height, so pages
+        don't shift while images load, and with Pillow installed a srcset of
+        resized variants no wider than the original.
+
+        cache_dir - where variants are kept by the hash of their source, so
+        each is only made once; index.json there remembers the hash and size
+        of every image by its (size, mtime), and the images each page shows.
+        None to not cache.
+        widths - the variant widths
+        lazy - add loading="lazy" and decoding="async"
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.widths = tuple(sorted(set(widths)))
+        self.lazy = lazy
+        # image -> [size, mtime_ns, digest, width, height]
+        self.sources: dict[str, list] = {}
+        # page -> [size, mtime_ns, images it shows] as process() left it
+        self.pages: dict[str, list] = {}
+        self.settings = None
+        if self.cache_dir is not None:
+            self._load(self.cache_dir / "index.json")
+        self.counts = {}
+
+    def _load(self, path):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != IMAGES_VERSION:
+            return
+        self.sources = data.get("sources", {})
+        self.pages = data.get("pages", {})
+        self.settings = data.get("settings")
+
+    def save(self):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / "index.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "version": IMAGES_VERSION,
+                    "settings": self.settings,
+                    "sources": self.sources,
+                    "pages": self.pages,
+                },
+                f,
+            )
+        os.replace(tmp, path)
+
+    def info(self, path: Path, rel: str) -> ImageInfo | None:
+        stat = path.stat()
+        key = [stat.st_size, stat.st_mtime_ns]
+        entry = self.sources.get(rel)
+        if entry is None or entry[:2] != key:
+            size = image_size(path)
+            if size is None:
+                return None
+            entry = [*key, hash_file(path), *size]
+            self.sources[rel] = entry
+            self.counts["read"] += 1
+        return ImageInfo(*entry[2:])
+
+    def variant_widths(self, suffix: str, info: ImageInfo) -> list[int]:
+        if Image is None or suffix.lower() not in RESIZABLE:
+            return []
+        return [width for width in self.widths if width < info.width]
+
+    def _derivative(self, info: ImageInfo, width: int, suffix: str) -> Path:
+        return self.cache_dir / info.digest[:2] / f"{info.digest}-{width}w{suffix}"
+
+    def process(self, root, basepath="/", workers=1) -> dict:
+        """
+        Makes the missing variants of the images under root over a process
+        pool, then updates the <img> tags of the html files written since the
+        last run, told by their (size, mtime), and of the pages showing an
+        image that changed.
+        workers - pool size, None or 0 for one worker per core
+        """
+        root = Path(root)
+        self.counts = {"read": 0, "made": 0, "reused": 0, "pages": 0}
+        previous = dict(self.sources)
+        images: dict[str, tuple[ImageInfo, list[int]]] = {}
+        pages = []
+        jobs = []
+        links = []
+        for path in sorted(root.rglob("*")):
+            suffix = path.suffix.lower()
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            if suffix == ".html":
+                pages.append(path)
+                continue
+            if suffix not in IMAGE_SUFFIXES or VARIANT_STEM.search(path.stem):
+                continue
+            rel = path.relative_to(root).as_posix()
+            info = self.info(path, rel)
+            if info is None:
+                continue
+            widths = self.variant_widths(path.suffix, info)
+            images[rel] = info, widths
+            for width in widths:
+                variant = path.with_name(f"{path.stem}-{width}w{path.suffix}")
+                if self.cache_dir is None:
+                    if not _newer(variant, path):
+                        jobs.append((path, variant, width))
+                    continue
+                derivative = self._derivative(info, width, path.suffix)
+                if derivative.exists():
+                    self.counts["reused"] += 1
+                else:
+                    jobs.append((path, derivative, width))
+                links.append((derivative, variant))
+        self._make(jobs, workers)
+        for derivative, variant in links:
+            if variant.exists() and os.path.samefile(derivative, variant):
+                continue
+            variant.unlink(missing_ok=True)
+            link_or_copy(derivative, variant)
+        # images that are gone don't stay in the index
+        self.sources = {rel: self.sources[rel] for rel in images}
+        # new, removed and edited images, by digest and size
+        changed = {
+            rel
+            for rel in previous.keys() | self.sources.keys()
+            if previous.get(rel, [])[2:] != self.sources.get(rel, [])[2:]
+        }
+        settings = [list(self.widths), self.lazy, Image is not None]
+        every = settings != self.settings
+        self.settings = settings
+        known = {}
+        for page in pages:
+            rel = page.relative_to(root).as_posix()
+            stat = page.stat()
+            entry = self.pages.get(rel)
+            if (
+                every
+                or entry is None
+                # a page the build wrote is smaller, its tags lack attributes
+                or entry[:2] != [stat.st_size, stat.st_mtime_ns]
+                or not changed.isdisjoint(entry[2])
+            ):
+                uses = set()
+                if self._rewrite(page, root, basepath, images, uses):
+                    self.counts["pages"] += 1
+                    stat = page.stat()
+                entry = [stat.st_size, stat.st_mtime_ns, sorted(uses)]
+            known[rel] = entry
+        self.pages = known
+        counts = self.counts
+        log(
+            f"Read {counts['read']} of {len(images)} images, made "
+            f"{counts['made']} and reused {counts['reused']} variants, "
+            f"updated {counts['pages']} pages"
+        )
+        return counts
+
+    def _make(self, jobs: list, workers):
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                _resize(job)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_resize, jobs, chunksize=chunksize))
+        self.counts["made"] += len(jobs)
+
+    def _rewrite(
+        self, page: Path, root: Path, basepath: str, images: dict, uses: set
+    ) -> bool:
+        html = page.read_text()
+
+        def replace(match):
+            return self.img_tag(match[0], page, root, basepath, images, uses)
+
+        rewritten = IMG_TAG.sub(replace, html)
+        if rewritten == html:
+            return False
+        tmp = page.with_name(f".{page.name}.tmp")
+        tmp.write_text(rewritten)
+        os.replace(tmp, page)
+        return True
+
+    def img_tag(
+        self, tag: str, page: Path, root: Path, basepath: str, images, uses=None
+    ) -> str:
+        """
+        The tag with the managed attributes set for the image it shows. Tags
+        sized by hand (sizing attributes but no data-responsive) are left
+        alone.
+        uses - a set to add the image, relative to root, to
+        """
+        attributes = {}
+        for match in ATTRIBUTE.finditer(tag, 4, len(tag) - 1):
+            value = next((v for v in match.groups()[1:] if v is not None), None)
+            attributes[match[1].lower()] = value
+        src = unescape(attributes.get("src") or "")
+        rel = _resolve(src, page, root, basepath) if src else None
+        if rel is not None and uses is not None:
+            uses.add(rel)
+        if MARKER not in attributes and not attributes.keys().isdisjoint(SIZING):
+            return tag
+        if rel not in images:
+            return tag
+        info, widths = images[rel]
+        for name in MANAGED:
+            attributes.pop(name, None)
+        attributes["width"] = str(info.width)
+        attributes["height"] = str(info.height)
+        if widths:
+            stem, dot, suffix = src.rpartition(".")
+            candidates = [f"{stem}-{width}w{dot}{suffix} {width}w" for width in widths]
+            candidates.append(f"{src} {info.width}w")
+            attributes["srcset"] = ", ".join(candidates)
+            attributes["sizes"] = f"(max-width: {info.width}px) 100vw, {info.width}px"
+        if self.lazy:
+            attributes["loading"] = "lazy"
+            attributes["decoding"] = "async"
+        attributes[MARKER] = None
+        parts = [
+            name if value is None else f'{name}="{escape(unescape(value))}"'
+            for name, value in attributes.items()
+        ]
+        return f"<img {' '.join(parts)}>"
@@ -0,0 +1,269 @@
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .assets import copy_file, hash_file, unchanged
+from .blockcache import renderer_version
+from .depgraph import DependencyGraph
+from .discovery import FileIndex, discover
+from .instrument import stage
+from .layouts import Layouts
+from .metadata import MetadataIndex
+from .parallel import generate_pages_parallel
+
+if TYPE_CHECKING:
+    from .listings import Listings
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 2
+
+
+def file_record(path, old: list | None = None) -> list:
+    """
+    The [size, mtime_ns, sha256] of a file. The hash of old, the record of an
+    earlier build, is reused while the size and mtime still match, so
+    unchanged files are never read.
+    """
+    stat = os.stat(path)
+    key = [stat.st_size, stat.st_mtime_ns]
+    if old is not None and old[:2] == key:
+        return old
+    return [*key, hash_file(path)]
+
+
+def _digest(record: list | None) -> str | None:
+    return record[2] if record else None
+
+
+class Manifest:
+    def __init__(
+        self,
+        templates: dict | None = None,
+        basepath: str = "",
+        pages: dict | None = None,
+        static: dict | None = None,
+        dependencies: dict | None = None,
+        listings: dict | None = None,
+        renderer: str = "",
+    ):
+        """
+        templates - maps every template and partial path to its file_record
+        basepath - the basepath the pages were rendered with
+        pages - maps a markdown path (relative to the content dir) to its
+        file_record
+        static - maps an asset path (relative to the static dir) to the
+        [size, mtime_ns] it was copied at
+        dependencies - maps an output page to the files it was built from
+        listings - maps a generated listing page to its fingerprint
+        renderer - the blockcache.renderer_version the pages were rendered by
+        """
+        self.templates = templates or {}
+        self.basepath = basepath
+        self.renderer = renderer
+        self.pages = pages or {}
+        self.static = static or {}
+        self.graph = DependencyGraph(dependencies)
+        self.listings = listings or {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a manifest, falling back to an empty one when the file is
+        missing or unreadable so the next build is simply a full build.
+        """
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls(
+            data.get("templates"),
+            data.get("basepath", ""),
+            data.get("pages"),
+            data.get("static"),
+            data.get("dependencies"),
+            data.get("listings"),
+            data.get("renderer", ""),
+        )
+
+    def save(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "renderer": self.renderer,
+                    "templates": self.templates,
+                    "basepath": self.basepath,
+                    "pages": self.pages,
+                    "static": self.static,
+                    "dependencies": self.graph.pages,
+                    "listings": self.listings,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+def _files(root: Path, suffix: str | None = None):
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and (suffix is None or path.suffix == suffix):
+            yield path.relative_to(root).as_posix(), path
+
+
+def _remove(path: Path, root: Path):
+    """
+    Removes a stale output and any directories it leaves empty.
+    """
+    path.unlink(missing_ok=True)
+    parent = path.parent
+    while parent != root and parent.is_dir() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def sync_static(source_dir, destination_dir, old: dict) -> tuple[dict, int, int]:
+    """
+    Copies only the assets whose output no longer matches them by size and
+    mtime (see assets.unchanged, copies keep the mtime), so nothing is read
+    for an unchanged asset, and deletes outputs whose source asset is gone.
+    A copy replaces its output in one rename, never rewriting it in place.
+
+    Returns the new [size, mtime_ns] map, the number of copied and of removed
+    files.
+    """
+    source_dir, destination_dir = Path(source_dir), Path(destination_dir)
+    stats = {}
+    copied = 0
+    for rel, path in _files(source_dir):
+        stat = path.stat()
+        stats[rel] = [stat.st_size, stat.st_mtime_ns]
+        dest = destination_dir / rel
+        if not unchanged(path, dest):
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f".{dest.name}.tmp")
+            tmp.unlink(missing_ok=True)
+            copy_file(path, tmp)
+            os.replace(tmp, dest)
+            copied += 1
+    stale = [rel for rel in old if rel not in stats]
+    for rel in stale:
+        _remove(destination_dir / rel, destination_dir)
+    return stats, copied, len(stale)
+
+
+def build_incremental(
+    static_dir,
+    content_dir,
+    template_path,
+    destination_dir,
+    basepath,
+    workers=1,
+    ignore=(),
+    index: FileIndex | None = None,
+    drafts=True,
+    listings: "Listings | None" = None,
+    metadata: MetadataIndex | None = None,
+) -> Manifest:
+    """
+    Builds the site into destination_dir, re-rendering only the pages whose
+    markdown changed or that depend on a changed template or partial. A
+    changed basepath invalidates every page.
+    template_path - the default template, or Layouts
+    workers - process pool size used for the pages that need rendering
+    ignore, index - see discovery.discover
+    drafts - False to leave out pages whose front matter sets draft: true
+    listings - generates listing pages, rewriting only those whose posts,
+    links or template changed
+    metadata - the front matter of the last build, to only re-read changed files
+    """
+    content_dir, destination_dir = Path(content_dir), Path(destination_dir)
+    layouts = Layouts.of(template_path, content_dir)
+    manifest_path = destination_dir / MANIFEST_NAME
+    old = Manifest.load(manifest_path)
+    new = Manifest(basepath=basepath, renderer=renderer_version())
+    metadata = metadata if metadata is not None else MetadataIndex()
+    # pages rendered by other code may render differently now
+    full = old.basepath != new.basepath or old.renderer != new.renderer
+
+    with stage("static"):
+        new.static, copied, removed = sync_static(
+            static_dir, destination_dir, old.static
+        )
+
+    jobs = []
+    with stage("hash"):
+        for path in layouts.files():
+            key = os.fspath(path)
+            new.templates[key] = file_record(path, old.templates.get(key))
+        changed = {
+            path
+            for path in new.templates.keys() | old.templates.keys()
+            if _digest(old.templates.get(path)) != _digest(new.templates.get(path))
+        }
+        outdated = old.graph.dependents(changed)
+        rels = discover(content_dir, ".md", ignore, index)
+        metadata.update(content_dir, rels)
+        for rel in rels:
+            path = content_dir / rel
+            if not drafts and metadata.is_draft(rel):
+                continue
+            new.pages[rel] = file_record(path, old.pages.get(rel))
+            output = Path(rel).with_suffix(".html").as_posix()
+            dependencies = layouts.dependencies(path)
+            new.graph.record(output, dependencies)
+            dest = destination_dir / output
+            if (
+                full
+                or _digest(old.pages.get(rel)) != _digest(new.pages[rel])
+                or output in outdated
+                # a new page, or one whose template or partials are different
+                or old.graph.dependencies(output) != dependencies
+                or not dest.exists()
+            ):
+                jobs.append((path, dest))
+    generate_pages_parallel(jobs, layouts, basepath, workers)
+    rendered = len(jobs)
+    stale = [rel for rel in old.pages if rel not in new.pages]
+    for rel in stale:
+        _remove(destination_dir / Path(rel).with_suffix(".html"), destination_dir)
+    removed += len(stale)
+
+    if listings is not None:
+        from .listings import generate_listings
+
+        pages = listings.pages(metadata, layouts)
+        for listing in pages:
+            dependencies = layouts.load(listing.template).dependencies
+            new.graph.record(listing.output, dependencies)
+        # a changed template or basepath rewrites its listings regardless
+        previous = {
+            output: fingerprint
+            for output, fingerprint in old.listings.items()
+            if not full and output not in outdated
+        }
+        new.listings, written = generate_listings(
+            pages, destination_dir, layouts, basepath, previous
+        )
+        gone = [
+            output
+            for output in old.listings
+            if output not in new.listings and output not in new.graph.pages
+        ]
+        for output in gone:
+            _remove(destination_dir / output, destination_dir)
+        print(
+            f"Generated {written}/{len(pages)} listing pages, "
+            f"removed {len(gone)} stale listings"
+        )
+
+    new.save(manifest_path)
+    print(
+        f"Rendered {rendered}/{len(new.pages)} pages, "
+        f"copied {copied}/{len(new.static)} assets, removed {removed} stale files"
+    )
+    return new
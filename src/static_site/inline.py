@@ -0,0 +1,115 @@
+import re
+from functools import cache
+from typing import NamedTuple
+
+from .textnode import TextType, TextNode
+
+IMAGE_PATTERN = r"!\[(?P<image>[^\]]*)\]\((?P<image_url>[^)]*)\)"
+LINK_PATTERN = r"\[(?P<link>[^\]]*)\]\((?P<link_url>[^)]*)\)"
+
+# findall gives the (text, url) pairs for extract_markdown_images/links
+IMAGE_RE = re.compile(IMAGE_PATTERN)
+LINK_RE = re.compile(LINK_PATTERN)
+
+# url group -> the group holding the alt or link text
+LABELS = {"image_url": "image", "link_url": "link"}
+
+DEFAULT_DELIMITERS = (
+    ("**", TextType.BOLD),
+    ("_", TextType.ITALIC),
+    ("`", TextType.CODE),
+)
+
+
+class Scanner(NamedTuple):
+    pattern: re.Pattern
+    # maps the last group of each alternative to the TextType it produces
+    kinds: dict[str, TextType]
+
+
+@cache
+def compile_scanner(
+    delimiters: tuple[tuple[str, TextType], ...] = DEFAULT_DELIMITERS,
+    images: bool = True,
+    links: bool = True,
+) -> Scanner:
+    """
+    Compiles every enabled inline construct into one alternation, so a single
+    finditer walk finds the leftmost token of any kind. Images and links come
+    first, which keeps delimiters inside urls (e.g. `_`) from being split.
+    """
+    alternatives = []
+    kinds = {}
+    if images:
+        alternatives.append(IMAGE_PATTERN)
+        kinds["image_url"] = TextType.IMAGE
+    if links:
+        alternatives.append(LINK_PATTERN)
+        kinds["link_url"] = TextType.LINK
+    for index, (delimiter, text_type) in enumerate(delimiters):
+        escaped = re.escape(delimiter)
+        alternatives.append(f"{escaped}(?P<d{index}>.*?){escaped}")
+        kinds[f"d{index}"] = text_type
+    return Scanner(re.compile("|".join(alternatives), re.DOTALL), kinds)
+
+
+DEFAULT_SCANNER = compile_scanner()
+
+
+def tokenize_inline(
+    text: str,
+    delimiters: tuple[tuple[str, TextType], ...] = DEFAULT_DELIMITERS,
+    images: bool = True,
+    links: bool = True,
+) -> list[TextNode]:
+    """
+    Splits text into TextNodes in one pass over the string.
+
+    Unclosed delimiters are left as plain text, and the content of a token is
+    not parsed again, so `**a _b_**` is a single bold node.
+    """
+    if delimiters is DEFAULT_DELIMITERS and images and links:
+        scanner = DEFAULT_SCANNER
+    else:
+        scanner = compile_scanner(delimiters, images, links)
+    return _tokenize(text, scanner)
+
+
+def _tokenize(text: str, scanner: Scanner) -> list[TextNode]:
+    pattern, kinds = scanner
+    nodes = []
+    append = nodes.append
+    position = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if start > position:
+            append(TextNode(text[position:start], TextType.TEXT))
+        position = end
+        kind = match.lastgroup
+        label = LABELS.get(kind)
+        if label is not None:
+            append(TextNode(match[label], kinds[kind], match[kind]))
+        elif match[kind]:
+            append(TextNode(match[kind], kinds[kind]))
+    if position < len(text):
+        append(TextNode(text[position:], TextType.TEXT))
+    return nodes
+
+
+def tokenize_nodes(
+    old_nodes: list[TextNode],
+    delimiters: tuple[tuple[str, TextType], ...] = DEFAULT_DELIMITERS,
+    images: bool = True,
+    links: bool = True,
+) -> list[TextNode]:
+    """
+    Runs tokenize_inline over the TEXT nodes, passing other nodes through.
+    """
+    scanner = compile_scanner(delimiters, images, links)
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type is not TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        new_nodes.extend(_tokenize(node.text, scanner))
+    return new_nodes
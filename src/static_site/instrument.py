@@ -0,0 +1,126 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+STAGES = (
+    "read",
+    "blocks",
+    "block_type",
+    "inline",
+    "tree",
+    "serialize",
+    "template",
+    "write",
+    "images",
+    "compress",
+)
+
+_NULL = nullcontext()
+_profiler = None
+_quiet = False
+
+
+class Profiler:
+    def __init__(self):
+        """
+        stages - exclusive seconds per stage, nested stages are not counted twice
+        pages - total seconds per page, keyed by the page source path
+        """
+        self.stages: dict[str, float] = {}
+        self.pages: dict[str, float] = {}
+        self._children = [0.0]
+
+    @contextmanager
+    def stage(self, name: str):
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            self._children[-1] += elapsed
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - children
+
+    @contextmanager
+    def page(self, path):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = str(path)
+            self.pages[key] = self.pages.get(key, 0.0) + time.perf_counter() - start
+
+    def snapshot(self) -> tuple[dict, dict]:
+        return dict(self.stages), dict(self.pages)
+
+    def merge(self, snapshot: tuple[dict, dict]):
+        """
+        Adds the timings of another profiler, e.g. one from a worker process.
+        """
+        stages, pages = snapshot
+        for name, seconds in stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for path, seconds in pages.items():
+            self.pages[path] = self.pages.get(path, 0.0) + seconds
+
+    def report(self, slowest: int = 10) -> str:
+        total = sum(self.stages.values())
+        names = [n for n in STAGES if n in self.stages]
+        names += sorted(n for n in self.stages if n not in STAGES)
+        lines = [f"{'stage':<12}{'seconds':>10}{'share':>8}"]
+        for name in names:
+            seconds = self.stages[name]
+            share = seconds / total if total else 0
+            lines.append(f"{name:<12}{seconds:>10.4f}{share:>8.1%}")
+        lines.append(f"{'total':<12}{total:>10.4f}")
+        if self.pages:
+            lines.append("")
+            lines.append(f"{len(self.pages)} pages, slowest {slowest}:")
+            ranked = sorted(self.pages.items(), key=lambda item: item[1], reverse=True)
+            for path, seconds in ranked[:slowest]:
+                lines.append(f"{seconds:>10.4f}  {path}")
+        return "\n".join(lines)
+
+
+def enable_profiling() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling():
+    global _profiler
+    _profiler = None
+
+
+def profiler() -> Profiler | None:
+    return _profiler
+
+
+def stage(name: str):
+    """
+    Times the wrapped block as stage name when profiling is on, otherwise a
+    shared no-op context manager.
+    """
+    if _profiler is None:
+        return _NULL
+    return _profiler.stage(name)
+
+
+def page(path):
+    if _profiler is None:
+        return _NULL
+    return _profiler.page(path)
+
+
+def set_quiet(quiet: bool = True):
+    global _quiet
+    _quiet = quiet
+
+
+def log(message: str):
+    """
+    Prints per file progress messages, unless the build runs with --quiet.
+    """
+    if not _quiet:
+        print(message)
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+from .template import Include, Template, load_template
+
+
+class Layouts:
+    def __init__(self, default_template, content_dir="content", templates_dir=None):
+        """
+        Picks the template of every page and expands the partials it includes.
+
+        default_template - used by every page outside a section with its own
+        templates_dir - holds section templates, e.g. templates/blog.html for
+        the pages under content/blog/, and partials/<name>.html for {{> name }};
+        defaults to templates/ next to default_template
+        """
+        self.default_template = Path(default_template)
+        self.content_dir = Path(content_dir)
+        if templates_dir is None:
+            templates_dir = self.default_template.parent / "templates"
+        self.templates_dir = Path(templates_dir)
+        self._loaded: dict[Path, Template] = {}
+
+    @classmethod
+    def of(cls, template, content_dir="content") -> "Layouts":
+        """
+        Accepts either Layouts or the path of a default template.
+        """
+        if isinstance(template, Layouts):
+            return template
+        return cls(template, content_dir)
+
+    @property
+    def partials_dir(self) -> Path:
+        return self.templates_dir / "partials"
+
+    def template_for(self, source) -> Path:
+        """
+        Returns the template of the markdown file source: the most specific
+        section template, e.g. templates/blog/tom.html then templates/blog.html
+        for content/blog/tom/index.md, or the default template.
+        """
+        try:
+            parts = Path(source).relative_to(self.content_dir).parent.parts
+        except ValueError:
+            return self.default_template
+        for end in range(len(parts), 0, -1):
+            candidate = self.templates_dir.joinpath(
+                *parts[: end - 1], parts[end - 1] + ".html"
+            )
+            if candidate.is_file():
+                return candidate
+        return self.default_template
+
+    def files(self) -> list[Path]:
+        """
+        Every file a page can depend on besides its markdown: the default
+        template, the section templates and the partials.
+        """
+        files = [self.default_template]
+        if self.templates_dir.is_dir():
+            files += sorted(
+                p for p in self.templates_dir.rglob("*.html") if p.is_file()
+            )
+        return files
+
+    def is_template_file(self, path) -> bool:
+        path = Path(path)
+        return path == self.default_template or (
+            path.suffix == ".html" and path.is_relative_to(self.templates_dir)
+        )
+
+    def load(self, path) -> Template:
+        """
+        Returns the template at path with its partials expanded. Its
+        dependencies are the template itself and every partial it pulled in.
+        """
+        path = Path(path)
+        if path not in self._loaded:
+            self._loaded[path] = self._expand(path, ())
+        return self._loaded[path]
+
+    def dependencies(self, source) -> list[str]:
+        """
+        The files the page built from source depends on, source first.
+        """
+        template = self.load(self.template_for(source))
+        return [os.fspath(source), *template.dependencies]
+
+    def _expand(self, path: Path, chain: tuple[Path, ...]) -> Template:
+        if path in chain:
+            cycle = " -> ".join(os.fspath(p) for p in (*chain, path))
+            raise ValueError(f"Partial includes itself: {cycle}")
+        template = load_template(path)
+        expanded = Template("")
+        dependencies = [os.fspath(path)]
+        for segment in template.segments:
+            if not isinstance(segment, Include):
+                expanded.segments.append(segment)
+                continue
+            partial_path = self.partials_dir / f"{segment.name}.html"
+            if not partial_path.is_file():
+                raise ValueError(f"Partial not found: {segment.source} in {path}")
+            partial = self._expand(partial_path, (*chain, path))
+            expanded.segments.extend(partial.segments)
+            dependencies += [d for d in partial.dependencies if d not in dependencies]
+        expanded.dependencies = tuple(dependencies)
+        return expanded
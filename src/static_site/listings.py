@@ -0,0 +1,218 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from .functions import rebase_url
+from .htmlnode import LeafNode, ParentNode
+from .instrument import log
+from .layouts import Layouts
+from .metadata import MetadataIndex
+
+
+def page_url(rel: str) -> str:
+    """
+    The root relative url of the page built from the markdown file rel, in
+    the form the site links to: "blog/tom/index.md" -> "/blog/tom".
+    """
+    path = Path(rel)
+    if path.name == "index.md":
+        parent = path.parent.as_posix()
+        return "/" if parent == "." else f"/{parent}"
+    return "/" + path.with_suffix(".html").as_posix()
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class ListingPage(NamedTuple):
+    output: str
+    title: str
+    posts: list[dict]
+    newer: str | None
+    older: str | None
+    template: Path
+
+    def fingerprint(self) -> str:
+        """
+        Changes exactly when the rendered page would, apart from its template.
+        """
+        data = [self.title, self.posts, self.newer, self.older, str(self.template)]
+        return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+
+class Listings:
+    def __init__(self, sections=(), per_page=10, drafts=False):
+        """
+        Generates an index page for every section in sections (e.g. "blog"
+        lists the pages under content/blog/), a page per tag used by those
+        pages, and paginates both per_page posts at a time, newest first.
+
+        The newest posts go to <section>/index.html, older ones to
+        <section>/page/<n>/index.html where page 1 holds the oldest; tag pages
+        to tags/<tag>/index.html and so on. A hand written <section>/index.md
+        takes the place of the first page.
+        """
+        if per_page < 1:
+            raise ValueError("per_page must be at least 1")
+        self.sections = tuple(s.strip("/") for s in sections)
+        self.per_page = per_page
+        self.drafts = drafts
+
+    def posts(self, metadata: MetadataIndex, section: str) -> list[dict]:
+        posts = []
+        for rel, entry in metadata.pages.items():
+            meta = entry["meta"]
+            if not rel.startswith(f"{section}/") or rel == f"{section}/index.md":
+                continue
+            if meta.get("draft") is True and not self.drafts:
+                continue
+            tags = meta.get("tags") or []
+            posts.append(
+                {
+                    "title": str(meta.get("title") or page_url(rel)),
+                    "url": page_url(rel),
+                    "date": str(meta.get("date") or ""),
+                    "tags": tags if isinstance(tags, list) else [tags],
+                }
+            )
+        # newest first, undated last, ties by title
+        posts.sort(key=lambda post: post["title"])
+        posts.sort(key=lambda post: post["date"], reverse=True)
+        return posts
+
+    def _paginate(self, root: str, title: str, posts: list, template: Path):
+        """
+        The newest per_page posts go on the index, the rest on archive pages
+        numbered from the oldest post, so a new post rewrites the index and
+        the newest archive page or two while page/<n> keeps its posts.
+        """
+        rest = posts[self.per_page :]
+        count = -(-len(rest) // self.per_page)
+
+        def url(number):
+            return f"/{root}" if number is None else f"/{root}/page/{number}"
+
+        def listing_page(number, chunk, newer, older):
+            return ListingPage(
+                output=(
+                    f"{root}/index.html"
+                    if number is None
+                    else f"{root}/page/{number}/index.html"
+                ),
+                title=title if number is None else f"{title}, page {number}",
+                posts=[
+                    {k: post[k] for k in ("title", "url", "date")} for post in chunk
+                ],
+                newer=newer,
+                older=older,
+                template=template,
+            )
+
+        yield listing_page(
+            None, posts[: self.per_page], None, url(count) if count else None
+        )
+        for number in range(count, 0, -1):
+            end = len(rest) - (number - 1) * self.per_page
+            yield listing_page(
+                number,
+                rest[max(0, end - self.per_page) : end],
+                url(number + 1 if number < count else None),
+                url(number - 1) if number > 1 else None,
+            )
+
+    def pages(self, metadata: MetadataIndex, layouts: Layouts) -> list[ListingPage]:
+        """
+        Every listing page of the site as it stands in metadata.
+        """
+        list_template = layouts.templates_dir / "list.html"
+        pages = []
+        tagged: dict[str, list[dict]] = {}
+        tag_names: dict[str, str] = {}
+        for section in self.sections:
+            posts = self.posts(metadata, section)
+            template = list_template
+            if not list_template.is_file():
+                template = layouts.template_for(
+                    layouts.content_dir / section / "index.md"
+                )
+            title = section.rpartition("/")[2].replace("-", " ").capitalize()
+            for page in self._paginate(section, title, posts, template):
+                if page.newer is None and f"{section}/index.md" in metadata.pages:
+                    log(f"Keeping the hand written index of {section}")
+                    continue
+                pages.append(page)
+            for post in posts:
+                slugs = {}
+                for tag in post["tags"]:
+                    slugs.setdefault(slugify(str(tag)), str(tag))
+                for slug, tag in slugs.items():
+                    tag_names.setdefault(slug, tag)
+                    tagged.setdefault(slug, []).append(post)
+        if not list_template.is_file():
+            list_template = layouts.default_template
+        for slug in sorted(tagged):
+            posts = tagged[slug]
+            # sections were merged, so order again
+            posts.sort(key=lambda post: post["title"])
+            posts.sort(key=lambda post: post["date"], reverse=True)
+            title = f"Posts tagged {tag_names[slug]}"
+            pages.extend(self._paginate(f"tags/{slug}", title, posts, list_template))
+        return pages
+
+
+def listing_node(page: ListingPage, basepath: str = "/") -> ParentNode:
+    items = []
+    for post in page.posts:
+        children = [
+            LeafNode("a", post["title"], {"href": rebase_url(post["url"], basepath)})
+        ]
+        if post["date"]:
+            children += [LeafNode(None, " "), LeafNode("time", post["date"])]
+        items.append(ParentNode("li", children))
+    children = [ParentNode("ul", items, {"class": "listing"})] if items else []
+    links = []
+    if page.newer:
+        links.append(LeafNode("a", "Newer", {"href": rebase_url(page.newer, basepath)}))
+    if page.older:
+        links.append(LeafNode("a", "Older", {"href": rebase_url(page.older, basepath)}))
+    if links:
+        children.append(ParentNode("nav", links, {"class": "pagination"}))
+    return ParentNode("div", children)
+
+
+def generate_listings(
+    pages: list[ListingPage],
+    dest_dir,
+    layouts: Layouts,
+    basepath: str,
+    previous: dict | None = None,
+) -> tuple[dict, int]:
+    """
+    Writes the listing pages whose fingerprint differs from previous (output ->
+    fingerprint of the last build), or every page when previous is None.
+
+    Returns the new output -> fingerprint map and the number of pages written.
+    """
+    dest_dir = Path(dest_dir)
+    fingerprints = {}
+    written = 0
+    for page in pages:
+        fingerprints[page.output] = page.fingerprint()
+        dest = dest_dir / page.output
+        unchanged = previous is not None and (
+            previous.get(page.output) == fingerprints[page.output]
+        )
+        if unchanged and dest.exists():
+            continue
+        log(f"Generating listing {dest} using {page.template}")
+        template = layouts.load(page.template).with_basepath(basepath)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, "w") as f:
+            template.write(
+                {"Title": page.title, "Content": listing_node(page, basepath)}, f
+            )
+        written += 1
+    return fingerprints, written
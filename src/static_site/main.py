@@ -0,0 +1,359 @@
+import argparse
+import sys
+from .assets import staged_output, sync_assets
+from .blockcache import enable_block_cache
+from .discovery import FileIndex
+from .functions import collect_page_jobs, generate_pages
+from .highlight import enable_highlight_cache
+from .instrument import enable_profiling, log, set_quiet, stage
+from .layouts import Layouts
+from .metadata import MetadataIndex
+from pathlib import Path
+
+# asyncio, the process pools, compression, listings and images are imported
+# where they're used, a plain build doesn't pay for them (see bench_import.py)
+
+
+def main(
+    basepath,
+    incremental=False,
+    jobs=1,
+    profile=0,
+    quiet=False,
+    cache_dir=".cache",
+    block_cache_size=4096,
+    async_io=0,
+    ignore=(),
+    drafts=False,
+    listing=(),
+    per_page=10,
+    compress=False,
+    minify=True,
+    images=False,
+    image_widths=None,
+    lazy_images=True,
+):
+    """
+    cache_dir - where caches are kept between builds, None to not persist them;
+    highlighted code is cached only there
+    block_cache_size - rendered blocks kept in memory, 0 turns the cache off
+    async_io - render with the asyncio pipeline and this many reads and writes
+    in flight, 0 to not use it
+    ignore - globs for content files and directories that aren't built
+    drafts - also build pages whose front matter sets draft: true
+    listing - sections to generate index, tag and archive pages for
+    per_page - posts per listing page
+    compress - write .gz (and .br) siblings of the text outputs
+    minify - when compressing, minify the html first
+    images - add width, height and (with Pillow) srcset to the <img> tags
+    image_widths - the widths of the resized variants
+    lazy_images - also add loading="lazy" to them
+    """
+    source_dir = "static"
+    destination_dir = "docs"
+    set_quiet(quiet)
+    profiler = enable_profiling() if profile else None
+    cache_path = Path(cache_dir) / "blocks.json" if cache_dir else None
+    cache = None
+    if block_cache_size:
+        cache = enable_block_cache(block_cache_size, cache_path)
+    highlighter = None
+    if cache_dir:
+        highlighter = enable_highlight_cache(Path(cache_dir) / "highlight")
+    index_path = Path(cache_dir) / "files.json" if cache_dir else None
+    index = FileIndex.load(index_path) if index_path else FileIndex()
+    metadata_path = Path(cache_dir) / "metadata.json" if cache_dir else None
+    metadata = MetadataIndex.load(metadata_path) if metadata_path else MetadataIndex()
+    responsive = None
+    if images:
+        from .images import DEFAULT_WIDTHS, ResponsiveImages
+
+        responsive = ResponsiveImages(
+            Path(cache_dir) / "images" if cache_dir else None,
+            image_widths or DEFAULT_WIDTHS,
+            lazy_images,
+        )
+    listings = None
+    if listing:
+        from .listings import Listings
+
+        listings = Listings(listing, per_page, drafts)
+    build(
+        source_dir,
+        destination_dir,
+        basepath,
+        incremental,
+        jobs,
+        async_io,
+        ignore,
+        index,
+        drafts,
+        listings,
+        metadata,
+        compress,
+        minify,
+        responsive,
+    )
+    print(index.stats())
+    if highlighter is not None:
+        print(highlighter.stats())
+    if index_path is not None:
+        index.save(index_path)
+    if metadata_path is not None:
+        metadata.save(metadata_path)
+    if responsive is not None:
+        responsive.save()
+    if cache is not None:
+        print(cache.stats())
+        if cache_path is not None:
+            cache.save(cache_path)
+    if profiler is not None:
+        print(profiler.report(slowest=profile))
+
+
+def build(
+    source_dir,
+    destination_dir,
+    basepath,
+    incremental,
+    jobs,
+    async_io=0,
+    ignore=(),
+    index=None,
+    drafts=False,
+    listings=None,
+    metadata=None,
+    compress=False,
+    minify=True,
+    images=None,
+):
+    """
+    images - a ResponsiveImages to run over the output before compressing
+    """
+    content_dir = Path("content")
+    layouts = Layouts("template.html", content_dir)
+    if incremental:
+        from .incremental import build_incremental
+
+        build_incremental(
+            source_dir,
+            content_dir,
+            layouts,
+            destination_dir,
+            basepath,
+            jobs,
+            ignore,
+            index,
+            drafts,
+            listings,
+            metadata,
+        )
+        if images is not None:
+            with stage("images"):
+                images.process(destination_dir, basepath, jobs)
+        if compress:
+            from .compress import postprocess
+
+            with stage("compress"):
+                postprocess(destination_dir, None, minify, jobs)
+        return
+    with staged_output(destination_dir) as staging_dir:
+        with stage("static"):
+            counts = sync_assets(source_dir, staging_dir, destination_dir)
+        log(f"Linked {counts['linked']} unchanged and copied {counts['copied']} assets")
+        if listings is not None and metadata is None:
+            metadata = MetadataIndex()
+        page_jobs = collect_page_jobs(
+            content_dir, staging_dir, ignore, index, drafts, metadata
+        )
+        if async_io:
+            import asyncio
+
+            from .asyncbuild import generate_pages_async
+
+            asyncio.run(generate_pages_async(page_jobs, layouts, basepath, async_io))
+        elif jobs == 1:
+            generate_pages(page_jobs, layouts, basepath)
+        else:
+            from .parallel import generate_pages_parallel
+
+            generate_pages_parallel(page_jobs, layouts, basepath, jobs)
+        if listings is not None:
+            from .listings import generate_listings
+
+            generate_listings(
+                listings.pages(metadata, layouts), staging_dir, layouts, basepath
+            )
+        if images is not None:
+            with stage("images"):
+                images.process(staging_dir, basepath, jobs)
+        if compress:
+            from .compress import postprocess
+
+            with stage("compress"):
+                postprocess(staging_dir, destination_dir, minify, jobs)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="static-site",
+        description="Build the static site into docs/",
+        epilog="Run `static-site serve --watch` for a local server that rebuilds on "
+        "save, or `static-site daemon` to keep the renderer warm for "
+        "`static-site-client`.",
+    )
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rebuild pages and assets that changed since the last build",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render pages, 0 for one per core",
+    )
+    parser.add_argument(
+        "--async-io",
+        nargs="?",
+        type=int,
+        const=16,
+        default=0,
+        metavar="N",
+        help="overlap page reads, renders and writes with N reads and writes in "
+        "flight (default 16), instead of -j; for slow or network volumes",
+    )
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="skip content files and directories matching GLOB, e.g. drafts or "
+        "'_*' (repeatable)",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also build pages whose front matter sets draft: true",
+    )
+    parser.add_argument(
+        "--listing",
+        action="append",
+        default=[],
+        metavar="SECTION",
+        help="generate index, tag and paginated archive pages for the pages under "
+        "content/SECTION from their front matter (repeatable)",
+    )
+    parser.add_argument(
+        "--per-page",
+        type=int,
+        default=10,
+        metavar="N",
+        help="posts per listing page (default 10)",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="minify the html and write precompressed .gz (and .br with brotli "
+        "installed) files next to the outputs, using the -j workers",
+    )
+    parser.add_argument(
+        "--no-minify",
+        dest="minify",
+        action="store_false",
+        help="with --compress, keep the html as rendered",
+    )
+    parser.add_argument(
+        "--images",
+        action="store_true",
+        help="give <img> tags their width and height, and with Pillow installed "
+        "a srcset of resized variants made with the -j workers and cached by "
+        "content in the cache dir",
+    )
+    parser.add_argument(
+        "--image-widths",
+        type=lambda value: [int(width) for width in value.split(",")],
+        metavar="W,W,...",
+        help="with --images, the variant widths (default 480,960,1600)",
+    )
+    parser.add_argument(
+        "--no-lazy-images",
+        dest="lazy_images",
+        action="store_false",
+        help='with --images, don\'t add loading="lazy"',
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=int,
+        const=10,
+        default=0,
+        metavar="N",
+        help="print a per stage timing report and the N slowest pages (default 10)",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="don't print a line per file"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".cache",
+        help="directory for caches kept between builds (default .cache)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="don't read or write caches on disk",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=4096,
+        metavar="N",
+        help="rendered blocks kept in memory, 0 turns the block cache off",
+    )
+    return parser.parse_args(argv)
+
+
+def cli(argv=None):
+    """
+    The console entry point: `static-site serve ...` and `static-site daemon
+    ...` run the dev server and the render daemon, anything else builds the
+    site.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from . import serve
+
+        return serve.main(argv[1:])
+    if argv[:1] == ["daemon"]:
+        from . import daemon
+
+        return daemon.main(argv[1:])
+    args = parse_args(argv)
+    main(
+        args.basepath,
+        incremental=args.incremental,
+        jobs=args.jobs,
+        profile=args.profile,
+        quiet=args.quiet,
+        cache_dir=args.cache_dir,
+        block_cache_size=args.block_cache_size,
+        async_io=args.async_io,
+        ignore=args.ignore,
+        drafts=args.drafts,
+        listing=args.listing,
+        per_page=args.per_page,
+        compress=args.compress,
+        minify=args.minify,
+        images=args.images,
+        image_widths=args.image_widths,
+        lazy_images=args.lazy_images,
+    )
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,69 @@
+import json
+import os
+from pathlib import Path
+
+from .blockstream import scan_metadata
+
+METADATA_VERSION = 1
+
+
+class MetadataIndex:
+    def __init__(self, pages: dict[str, dict] | None = None):
+        """
+        pages - maps a markdown path, relative to the content dir, to its
+        front matter (with the title) and the [size, mtime_ns] it was read at
+        """
+        self.pages: dict[str, dict] = pages or {}
+        self.read = 0
+
+    @classmethod
+    def load(cls, path) -> "MetadataIndex":
+        """
+        Loads the index of an earlier build, or an empty one when the file is
+        missing, unreadable or from another version.
+        """
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != METADATA_VERSION:
+            return cls()
+        return cls(data.get("pages"))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": METADATA_VERSION, "pages": self.pages}, f)
+        os.replace(tmp, path)
+
+    def update(self, content_dir, rels):
+        """
+        Brings the index in line with the markdown files rels: only the head of
+        a new or modified file is read, and files not in rels are dropped.
+        """
+        content_dir = Path(content_dir)
+        pages = {}
+        for rel in rels:
+            stat = os.stat(content_dir / rel)
+            key = [stat.st_size, stat.st_mtime_ns]
+            entry = self.pages.get(rel)
+            if entry is None or entry["stat"] != key:
+                try:
+                    meta = scan_metadata(content_dir / rel)
+                except ValueError as e:
+                    raise ValueError(f"{rel}: {e}") from e
+                # dates and such from TOML aren't JSON types, keep their text
+                meta = json.loads(json.dumps(meta, default=str))
+                entry = {"meta": meta, "stat": key}
+                self.read += 1
+            pages[rel] = entry
+        self.pages = pages
+
+    def meta(self, rel: str) -> dict:
+        return self.pages[rel]["meta"]
+
+    def is_draft(self, rel: str) -> bool:
+        return self.meta(rel).get("draft") is True
@@ -0,0 +1,131 @@
+import os
+from pathlib import Path
+
+from .blockcache import block_cache, enable_block_cache
+from .functions import collect_page_jobs, generate_pages, write_page
+from .highlight import enable_highlight_cache, highlight_cache
+from .instrument import enable_profiling, log, page, profiler
+from .layouts import Layouts
+
+_layouts: Layouts | None = None
+_basepath: str = "/"
+_profile: bool = False
+
+
+def _init_worker(
+    layouts: Layouts,
+    basepath: str,
+    profile: bool = False,
+    cache=None,
+    highlight_dir=None,
+):
+    """
+    layouts - with every template the jobs use already loaded
+    cache - (maxsize, entries) of the parent's block cache, None when it is off
+    highlight_dir - the parent's highlight cache directory, shared on disk
+    """
+    global _layouts, _basepath, _profile
+    _layouts = layouts
+    _basepath = basepath
+    _profile = profile
+    if cache is not None:
+        maxsize, entries = cache
+        enable_block_cache(maxsize).merge(0, 0, entries)
+    if highlight_dir is not None:
+        enable_highlight_cache(highlight_dir)
+
+
+def _build_page(job: tuple[Path, Path]) -> dict:
+    """
+    Returns what the parent merges into its own state: the timings of this
+    page when profiling and the block cache counters and new entries.
+    """
+    from_path, dest_path = job
+    template = _layouts.load(_layouts.template_for(from_path))
+    stats = {}
+    if _profile:
+        worker_profiler = enable_profiling()
+        with page(from_path):
+            write_page(from_path, template, dest_path, _basepath)
+        stats["profile"] = worker_profiler.snapshot()
+    else:
+        write_page(from_path, template, dest_path, _basepath)
+    if block_cache() is not None:
+        stats["cache"] = block_cache().take_stats()
+    if highlight_cache() is not None:
+        stats["highlight"] = highlight_cache().take_stats()
+    return stats
+
+
+def generate_pages_parallel(
+    jobs: list[tuple[Path, Path]],
+    template_path: str | Layouts,
+    basepath: str,
+    workers=None,
+):
+    """
+    Renders and writes the pages over a process pool.
+
+    The templates are compiled once and handed to every worker. Results are consumed
+    in job order, so the log and the first error raised match the serial path.
+    workers - pool size, None or 0 for one worker per core
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        generate_pages(jobs, template_path, basepath)
+        return
+    # imported here, the serial path above never needs it
+    from concurrent.futures import ProcessPoolExecutor
+
+    layouts = Layouts.of(template_path)
+    page_templates = [layouts.template_for(from_path) for from_path, _ in jobs]
+    for page_template in set(page_templates):
+        layouts.load(page_template)
+    chunksize = max(1, len(jobs) // (workers * 4))
+    main_profiler = profiler()
+    cache = block_cache()
+    cache_state = None if cache is None else (cache.maxsize, dict(cache.entries))
+    highlighter = highlight_cache()
+    highlight_dir = None if highlighter is None else highlighter.directory
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            layouts,
+            basepath,
+            main_profiler is not None,
+            cache_state,
+            highlight_dir,
+        ),
+    ) as pool:
+        results = pool.map(_build_page, jobs, chunksize=chunksize)
+        try:
+            for (from_path, dest_path), page_template in zip(jobs, page_templates):
+                log(
+                    f"Generating page from {from_path} to {dest_path} using {page_template}"
+                )
+                stats = next(results)
+                if "profile" in stats:
+                    main_profiler.merge(stats["profile"])
+                if "cache" in stats:
+                    cache.merge(*stats["cache"])
+                if "highlight" in stats:
+                    highlighter.merge(*stats["highlight"])
+        except Exception:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+
+def generate_pages_recursive_parallel(
+    dir_path: Path,
+    template_path: str | Layouts,
+    dest_dir_path: Path,
+    basepath: str,
+    workers=None,
+):
+    generate_pages_parallel(
+        collect_page_jobs(dir_path, dest_dir_path),
+        Layouts.of(template_path, dir_path),
+        basepath,
+        workers,
+    )
@@ -0,0 +1,311 @@
+import argparse
+import os
+import shutil
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .blockcache import enable_block_cache
+from .depgraph import DependencyGraph
+from .functions import generate_pages
+from .incremental import build_incremental
+from .layouts import Layouts
+
+RELOAD_PATH = "/__livereload"
+RELOAD_SCRIPT = (
+    f'<script>new EventSource("{RELOAD_PATH}").onmessage = '
+    "() => location.reload();</script>"
+)
+
+
+def snapshot(*roots) -> dict[str, tuple[int, int]]:
+    """
+    Maps every file under roots (or a root that is itself a file) to its
+    (mtime_ns, size), which is all the polling watcher compares.
+    """
+    files = {}
+    stack = [os.fspath(root) for root in roots]
+    while stack:
+        path = stack.pop()
+        try:
+            if not os.path.isdir(path):
+                stat = os.stat(path)
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+                continue
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            continue
+    return files
+
+
+def diff_snapshots(old: dict, new: dict) -> tuple[set[str], set[str]]:
+    """
+    Returns the paths that were added or modified and the paths that are gone.
+    """
+    changed = {path for path, stat in new.items() if old.get(path) != stat}
+    removed = set(old) - set(new)
+    return changed, removed
+
+
+class SiteBuilder:
+    def __init__(
+        self, static_dir, content_dir, template_path, destination_dir, basepath="/"
+    ):
+        self.static_dir = Path(static_dir)
+        self.content_dir = Path(content_dir)
+        self.template_path = Path(template_path)
+        self.destination_dir = Path(destination_dir)
+        self.basepath = basepath
+        self.templates_dir = self.layouts().templates_dir
+        self.graph = DependencyGraph()
+
+    def layouts(self) -> Layouts:
+        # a fresh one per build, so edited templates and partials are reloaded
+        return Layouts(self.template_path, self.content_dir)
+
+    def output_for(self, path) -> Path | None:
+        """
+        Returns the file in destination_dir that path is built into.
+        """
+        path = Path(path)
+        if path.is_relative_to(self.content_dir) and path.suffix == ".md":
+            rel = path.relative_to(self.content_dir).with_suffix(".html")
+            return self.destination_dir / rel
+        if path.is_relative_to(self.static_dir):
+            return self.destination_dir / path.relative_to(self.static_dir)
+        return None
+
+    def full_build(self, workers=1):
+        manifest = build_incremental(
+            self.static_dir,
+            self.content_dir,
+            self.layouts(),
+            self.destination_dir,
+            self.basepath,
+            workers,
+        )
+        self.graph = manifest.graph
+
+    def apply(self, changed: set[str], removed: set[str]) -> int:
+        """
+        Rebuilds only what the changed and removed paths affect. A template or
+        partial change re-renders the pages built from it. Render errors are
+        printed instead of raised so a typo doesn't stop the server.
+
+        Returns the number of outputs written or removed.
+        """
+        count = 0
+        layouts = self.layouts()
+        templates = {p for p in changed | removed if layouts.is_template_file(p)}
+        if templates:
+            try:
+                jobs = self._outdated(layouts, templates)
+                self._generate(jobs, layouts)
+            except Exception as e:
+                print(f"Error: {e}")
+            else:
+                count += len(jobs)
+            changed, removed = changed - templates, removed - templates
+        for path in sorted(changed):
+            dest = self.output_for(path)
+            if dest is None:
+                continue
+            if Path(path).is_relative_to(self.content_dir):
+                count += self._run(self._generate, [(Path(path), dest)], layouts)
+            else:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, dest)
+                print(f"Copied {path} to {dest}")
+                count += 1
+        for path in sorted(removed):
+            dest = self.output_for(path)
+            if dest is not None and Path(path).is_relative_to(self.content_dir):
+                self.graph.forget(self._output_name(dest))
+            if dest is not None and dest.exists():
+                dest.unlink()
+                print(f"Removed {dest}")
+                count += 1
+        return count
+
+    def _output_name(self, dest: Path) -> str:
+        return dest.relative_to(self.destination_dir).as_posix()
+
+    def _outdated(self, layouts: Layouts, templates: set[str]) -> list:
+        """
+        The pages built from any of templates, plus those that a new or removed
+        section template moves to another template.
+        """
+        outputs = self.graph.dependents(templates)
+        jobs = []
+        for path in sorted(self.content_dir.rglob("*.md")):
+            dest = self.output_for(path)
+            output = self._output_name(dest)
+            if output in outputs or (
+                self.graph.dependencies(output) != layouts.dependencies(path)
+            ):
+                jobs.append((path, dest))
+        return jobs
+
+    def _generate(self, jobs: list, layouts: Layouts):
+        generate_pages(jobs, layouts, self.basepath)
+        for path, dest in jobs:
+            self.graph.record(self._output_name(dest), layouts.dependencies(path))
+
+    def _run(self, step, *args) -> int:
+        try:
+            step(*args)
+        except Exception as e:
+            print(f"Error: {e}")
+            return 0
+        return 1
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version: int, timeout: float) -> int:
+        """
+        Blocks until the version moves past version or timeout runs out.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    livereload: LiveReload
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            return self.stream_reloads()
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.endswith("/"):
+            path = path / "index.html"
+        if path.suffix != ".html" or not path.is_file():
+            return super().do_GET()
+        body = path.read_bytes()
+        script = RELOAD_SCRIPT.encode()
+        if b"</body>" in body:
+            body = body.replace(b"</body>", script + b"</body>", 1)
+        else:
+            body += script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = self.livereload.version
+        try:
+            while True:
+                current = self.livereload.wait(version, timeout=15)
+                if current != version:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = current
+                else:
+                    # keeps the connection alive and notices closed tabs
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+def make_server(directory, port: int, livereload: LiveReload) -> ThreadingHTTPServer:
+    class Handler(DevRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=os.fspath(directory), **kwargs)
+
+    Handler.livereload = livereload
+    server = ThreadingHTTPServer(("", port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def watch(builder: SiteBuilder, livereload: LiveReload, interval: float = 0.5):
+    roots = (
+        builder.content_dir,
+        builder.static_dir,
+        builder.template_path,
+        builder.templates_dir,
+    )
+    previous = snapshot(*roots)
+    while True:
+        time.sleep(interval)
+        current = snapshot(*roots)
+        changed, removed = diff_snapshots(previous, current)
+        previous = current
+        if changed or removed:
+            if builder.apply(changed, removed):
+                livereload.bump()
+
+
+def serve(
+    basepath="/",
+    port=8888,
+    watch_files=False,
+    jobs=1,
+    static_dir="static",
+    content_dir="content",
+    template_path="template.html",
+    destination_dir="docs",
+):
+    builder = SiteBuilder(
+        static_dir, content_dir, template_path, destination_dir, basepath
+    )
+    # unchanged blocks of an edited page are served from memory on rebuild
+    enable_block_cache()
+    builder.full_build(jobs)
+    livereload = LiveReload()
+    server = make_server(destination_dir, port, livereload)
+    print(f"Serving {destination_dir} on http://localhost:{port}/")
+    if not watch_files:
+        server.serve_forever()
+        return
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        watch(builder, livereload)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="static-site serve", description="Build docs/ and serve it locally"
+    )
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("-p", "--port", type=int, default=8888)
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="rebuild changed pages and assets and reload open browser tabs",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    serve(args.basepath, args.port, args.watch, args.jobs)
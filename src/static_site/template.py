@@ -0,0 +1,135 @@
+import os
+import re
+from functools import lru_cache
+
+# {{ Name }} is a slot, {{> name }} includes the partial called name
+SLOT_PATTERN = re.compile(r"\{\{\s*(>\s*)?([\w./-]+)\s*\}\}")
+# a root relative href or src; protocol relative //host urls are left alone
+ROOT_URL = re.compile(r'(href|src)="/(?!/)')
+
+
+class Slot:
+    def __init__(self, name: str, source: str):
+        """
+        name - the placeholder name, e.g. "Title" for {{ Title }}
+        source - the placeholder as written, rendered back when there is no value
+        """
+        self.name = name
+        self.source = source
+
+    def __repr__(self):
+        return f"Slot({self.name})"
+
+    def __eq__(self, other):
+        return isinstance(other, Slot) and self.name == other.name
+
+
+class Include:
+    def __init__(self, name: str, source: str):
+        """
+        name - the partial name, e.g. "nav" for {{> nav }}
+        source - the include as written, for error messages
+        """
+        self.name = name
+        self.source = source
+
+    def __repr__(self):
+        return f"Include({self.name})"
+
+    def __eq__(self, other):
+        return isinstance(other, Include) and self.name == other.name
+
+
+class Template:
+    def __init__(self, source: str):
+        """
+        Parses the template once into a list of static strings, Slots and
+        Includes. dependencies lists the files the template was built from,
+        once its partials are expanded (see layouts.Layouts).
+        """
+        self.segments: list[str | Slot | Include] = []
+        self.dependencies: tuple[str, ...] = ()
+        self._rebased: dict[str, Template] = {}
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            if match.start() > position:
+                self.segments.append(source[position : match.start()])
+            if match[1]:
+                self.segments.append(Include(match[2], match[0]))
+            else:
+                self.segments.append(Slot(match[2], match[0]))
+            position = match.end()
+        if position < len(source):
+            self.segments.append(source[position:])
+
+    @property
+    def slots(self) -> set[str]:
+        return {segment.name for segment in self.segments if isinstance(segment, Slot)}
+
+    @property
+    def includes(self) -> set[str]:
+        return {
+            segment.name for segment in self.segments if isinstance(segment, Include)
+        }
+
+    def with_basepath(self, basepath: str) -> "Template":
+        """
+        Returns a copy whose static segments have root relative href and src
+        attributes rewritten to start with basepath, as rebase_url does.
+        """
+        if basepath == "/":
+            return self
+        if basepath in self._rebased:
+            return self._rebased[basepath]
+        rebased = Template("")
+        rebased.dependencies = self.dependencies
+        rebased.segments = [
+            ROOT_URL.sub(lambda match: f'{match[1]}="{basepath}', segment)
+            if isinstance(segment, str)
+            else segment
+            for segment in self.segments
+        ]
+        self._rebased[basepath] = rebased
+        return rebased
+
+    def iter_render(self, context: dict):
+        """
+        Yields the rendered template in chunks. Values with an iter_html method
+        (HTMLNodes) are streamed, anything else is converted with str().
+        Placeholders without a value in context are left as written.
+        """
+        for segment in self.segments:
+            if isinstance(segment, str):
+                yield segment
+                continue
+            if isinstance(segment, Include):
+                raise ValueError(f"Partial {segment.source} was not expanded")
+            value = context.get(segment.name)
+            if value is None:
+                yield segment.source
+            elif hasattr(value, "iter_html"):
+                yield from value.iter_html()
+            else:
+                yield str(value)
+
+    def render(self, context: dict) -> str:
+        return "".join(self.iter_render(context))
+
+    def write(self, context: dict, fp):
+        fp.writelines(self.iter_render(context))
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: str, mtime_ns: int, size: int) -> Template:
+    with open(path, "r") as f:
+        return Template(f.read())
+
+
+def load_template(path) -> Template:
+    """
+    Returns the compiled template for path, parsing the file only when it
+    changed since the last call.
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    return _load_template(path, stat.st_mtime_ns, stat.st_size)
@@ -11,9 +11,14 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type: TextType, url: str | None = None):
         self.text = text
-        self.text_type = TextType(text_type)
+        # only coerce raw values like "bold", the parser always passes members
+        self.text_type = (
+            text_type if type(text_type) is TextType else TextType(text_type)
+        )
         self.url = url
 
     def __repr__(self):
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from static_site.api import Renderer, render, render_many
+from static_site.functions import markdown_to_html_node
+from static_site.highlight import disable_highlight_cache, enable_highlight_cache
+
+
+class TestApi(unittest.TestCase):
+    def test_render_matches_markdown_to_html_node(self):
+        md = "# Title\n\nSome **bold** and a [link](/a)\n\n- one\n- two"
+        self.assertEqual(render(md), markdown_to_html_node(md).to_html())
+
+    def test_template_and_context(self):
+        html = render(
+            "---\nauthor: Sam\n---\n# Hi\n\ntext",
+            template="<h1>{{ Title }}</h1><i>{{ author }}</i>{{ Content }}",
+            context={"Title": "Override"},
+        )
+        self.assertEqual(
+            html, "<h1>Override</h1><i>Sam</i><div><h1>Hi</h1><p>text</p></div>"
+        )
+
+    def test_snippet_without_title(self):
+        self.assertEqual(
+            render("just text", template="[{{ Title }}]{{ Content }}"),
+            "[]<div><p>just text</p></div>",
+        )
+
+    def test_front_matter_errors_are_raised(self):
+        with self.assertRaisesRegex(ValueError, "Invalid front matter"):
+            render("+++\ntitle = \n+++\n\n# Title\n\nsome user text")
+
+    def test_render_many(self):
+        renderer = Renderer("<b>{{ who }}</b>{{ Content }}", basepath="/site/")
+        pages = renderer.render_many(["[a](/x)", ("b", {"who": "Frodo"})])
+        self.assertEqual(
+            next(pages), '<b>{{ who }}</b><div><p><a href="/site/x">a</a></p></div>'
+        )
+        self.assertEqual(next(pages), "<b>Frodo</b><div><p>b</p></div>")
+        self.assertEqual(
+            list(render_many(["x", "y"])),
+            ["<div><p>x</p></div>", "<div><p>y</p></div>"],
+        )
+
+    def test_own_block_cache(self):
+        renderer = Renderer()
+        self.assertEqual(len(renderer.cache.entries), 0)
+        renderer.render("para\n\nother")
+        renderer.render("para")
+        self.assertEqual((renderer.cache.hits, renderer.cache.misses), (1, 2))
+        self.assertIsNone(Renderer(cache_size=0).cache)
+
+    def test_no_disk_access(self):
+        renderer = Renderer("<p>{{ Content }}</p>")
+        with mock.patch("builtins.open", side_effect=AssertionError("disk")):
+            renderer.render("# a\n\nb")
+
+    def test_build_highlight_cache_is_not_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            enable_highlight_cache(tmp)
+            try:
+                html = Renderer().render("```py\nx = 1\n```")
+            finally:
+                disable_highlight_cache()
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertIn('<code class="language-py">', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.assets import exchange, staged_output, swap_in, sync_assets, unchanged
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.static = self.root / "static"
+        self.docs = self.root / "docs"
+        (self.static / "images").mkdir(parents=True)
+        (self.static / "index.css").write_text("body {}")
+        (self.static / "images" / "a.png").write_bytes(b"png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, compare="mtime"):
+        with redirect_stdout(StringIO()), staged_output(self.docs) as staging:
+            return sync_assets(self.static, staging, self.docs, compare)
+
+    def test_first_build_copies(self):
+        self.assertEqual(self.build(), {"linked": 0, "copied": 2})
+        self.assertEqual((self.docs / "images" / "a.png").read_bytes(), b"png")
+        self.assertFalse((self.root / ".docs.staging").exists())
+
+    def test_unchanged_files_are_linked(self):
+        self.build()
+        inode = (self.docs / "images" / "a.png").stat().st_ino
+        self.assertEqual(self.build(), {"linked": 2, "copied": 0})
+        self.assertEqual((self.docs / "images" / "a.png").stat().st_ino, inode)
+
+    def test_changed_and_stale_files(self):
+        self.build()
+        (self.static / "index.css").write_text("body { color: red }")
+        (self.static / "images" / "a.png").unlink()
+        self.assertEqual(self.build(), {"linked": 0, "copied": 1})
+        self.assertEqual((self.docs / "index.css").read_text(), "body { color: red }")
+        self.assertFalse((self.docs / "images" / "a.png").exists())
+
+    def test_unchanged_by_hash(self):
+        self.build()
+        source = self.static / "index.css"
+        os.utime(source, ns=(0, 0))
+        self.assertFalse(unchanged(source, self.docs / "index.css"))
+        self.assertTrue(unchanged(source, self.docs / "index.css", compare="hash"))
+
+    def test_failed_build_keeps_old_output(self):
+        self.build()
+        with self.assertRaises(RuntimeError):
+            with staged_output(self.docs) as staging:
+                (staging / "partial.html").write_text("")
+                raise RuntimeError("render failed")
+        self.assertTrue((self.docs / "index.css").exists())
+        self.assertFalse((self.docs / "partial.html").exists())
+        self.assertFalse((self.root / ".docs.staging").exists())
+
+    def test_swap_in(self):
+        self.build()
+        staging = self.root / "new"
+        staging.mkdir()
+        (staging / "index.html").write_text("new")
+        swap_in(staging, self.docs)
+        self.assertEqual(os.listdir(self.docs), ["index.html"])
+        self.assertEqual(sorted(os.listdir(self.root)), ["docs", "static"])
+
+    def test_exchange(self):
+        first, second = self.root / "first", self.root / "second"
+        first.mkdir()
+        second.write_text("file")
+        if not exchange(first, second):
+            self.skipTest("renameat2 is not available")
+        self.assertTrue(first.is_file())
+        self.assertTrue(second.is_dir())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from static_site.asyncbuild import generate_pages_async, generate_pages_recursive_async
+from static_site.functions import generate_pages_recursive
+from test_parallel import PageTreeTestCase
+
+
+class TestAsyncBuild(PageTreeTestCase):
+    def test_matches_serial_output(self):
+        with redirect_stdout(StringIO()) as serial_log:
+            generate_pages_recursive(
+                self.content, self.template, self.root / "serial", "/site/"
+            )
+        serial = self.read_tree(self.root / "serial")
+        self.assertEqual(len(serial), 12)
+        for in_flight in (1, 4):
+            dest = self.root / f"async{in_flight}"
+            with redirect_stdout(StringIO()) as async_log:
+                asyncio.run(
+                    generate_pages_recursive_async(
+                        self.content, self.template, dest, "/site/", in_flight
+                    )
+                )
+            self.assertEqual(serial, self.read_tree(dest))
+            self.assertEqual(
+                serial_log.getvalue().replace(str(self.root / "serial"), ""),
+                async_log.getvalue().replace(str(dest), ""),
+            )
+
+    def test_error_is_raised(self):
+        (self.content / "section0" / "page0" / "index.md").write_text("no title")
+        with (
+            redirect_stdout(StringIO()),
+            self.assertRaisesRegex(ValueError, "No title found"),
+        ):
+            asyncio.run(
+                generate_pages_recursive_async(
+                    self.content, self.template, self.root / "docs", "/", 2
+                )
+            )
+
+    def test_in_flight_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(generate_pages_async([], self.template, "/", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
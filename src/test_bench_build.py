@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from bench_build import generate_corpus, run_benchmark
+from static_site.functions import extract_title
+
+
+class TestBenchBuild(unittest.TestCase):
+    def test_corpus_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = generate_corpus(Path(tmp) / "a", pages=10, depth=3, seed=4)
+            second = generate_corpus(Path(tmp) / "b", pages=10, depth=3, seed=4)
+            self.assertEqual(len(first), 10)
+            self.assertEqual(
+                [p.read_text() for p in first], [p.read_text() for p in second]
+            )
+            for path in first:
+                self.assertTrue(extract_title(path.read_text()))
+                self.assertLessEqual(len(path.relative_to(Path(tmp) / "a").parts), 5)
+
+    def test_block_mix(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (path,) = generate_corpus(tmp, pages=1, blocks=5, block_mix={"code": 1})
+            self.assertEqual(path.read_text().count("```"), 10)
+
+    def test_run_benchmark(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_corpus(Path(tmp) / "content", pages=5, blocks=5)
+            results = run_benchmark(Path(tmp) / "content", Path(tmp) / "out")
+            self.assertEqual(results["pages"], 5)
+            self.assertGreater(results["peak_memory_bytes"], 0)
+            self.assertIn("text_to_textnodes", results["stages"])
+            self.assertEqual(len(list((Path(tmp) / "out" / "full").rglob("*.html"))), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from bench_import import LAZY, eager_imports, parse_importtime
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       4100 |     textnode
+import time:      2000 |      47000 | main
+"""
+
+
+class TestBenchImport(unittest.TestCase):
+    def test_parse_importtime(self):
+        self.assertEqual(
+            parse_importtime(OUTPUT), {"_io": 120, "textnode": 4100, "main": 47000}
+        )
+
+    def test_entry_points_import_lazily(self):
+        for module, lazy in LAZY.items():
+            with self.subTest(module=module):
+                self.assertEqual(eager_imports(module, lazy), [])
+
+    def test_eager_imports(self):
+        self.assertEqual(
+            eager_imports("static_site.functions", ("static_site.textnode", "asyncio")),
+            ["static_site.textnode"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
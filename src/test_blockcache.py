@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from static_site import blockcache
+from static_site.blockcache import BlockCache, disable_block_cache, enable_block_cache
+from static_site.blocks import BlockType
+from static_site.functions import markdown_to_html_node
+
+MD = """
+# Title
+
+Shared **footer** text
+
+Shared **footer** text
+"""
+
+
+class TestBlockCache(unittest.TestCase):
+    def tearDown(self):
+        disable_block_cache()
+
+    def test_lru_eviction(self):
+        cache = BlockCache(maxsize=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_key_depends_on_type_and_basepath(self):
+        key = BlockCache.key("x", BlockType.PARAGRAPH, "/")
+        self.assertEqual(key, BlockCache.key("x", BlockType.PARAGRAPH, "/"))
+        self.assertNotEqual(key, BlockCache.key("x", BlockType.QUOTE, "/"))
+        self.assertNotEqual(key, BlockCache.key("x", BlockType.PARAGRAPH, "/a/"))
+
+    def test_cached_render_matches(self):
+        expected = markdown_to_html_node(MD).to_html()
+        cache = enable_block_cache()
+        self.assertEqual(markdown_to_html_node(MD).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(markdown_to_html_node(MD).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 2))
+        self.assertIn("4 hits, 2 misses (67% hit rate)", cache.stats())
+
+    def test_persisted_between_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "blocks.json"
+            enable_block_cache(path=path)
+            markdown_to_html_node(MD)
+            blockcache.block_cache().save(path)
+            cache = enable_block_cache(path=path)
+            markdown_to_html_node(MD)
+            self.assertEqual((cache.hits, cache.misses), (3, 0))
+            with mock.patch.object(blockcache, "renderer_version", return_value="x"):
+                self.assertEqual(len(enable_block_cache(path=path).entries), 0)
+
+    def test_take_stats(self):
+        cache = BlockCache()
+        cache.get("a")
+        cache.put("a", "1")
+        self.assertEqual(cache.take_stats(), (0, 1, {"a": "1"}))
+        self.assertEqual(cache.take_stats(), (0, 0, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
-from functions import block_to_block_type, markdown_to_blocks
-from blocks import BlockType
+from static_site.functions import block_to_block_type, markdown_to_blocks
+from static_site.blocks import BlockType
 
 
 class TestBlock(unittest.TestCase):
@@ -66,3 +66,8 @@ This is the same paragraph on a new line
             block_to_block_type("# you should have gone for the head"),
             BlockType.HEADING,
         )
+
+    def test_block_prefix_edge_cases(self):
+        self.assertEqual(block_to_block_type(""), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("`code` first"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("10 things"), BlockType.PARAGRAPH)
@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from static_site.blockstream import MarkdownReader, is_draft, iter_blocks, scan_metadata
+from static_site.functions import markdown_to_blocks, render_page
+
+
+class TestBlockStream(unittest.TestCase):
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "intro\n\n```\ndef a():\n\n    return 1\n```\n\nafter"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["intro", "```\ndef a():\n\n    return 1\n```", "after"],
+        )
+
+    def test_fence_interrupts_paragraph(self):
+        md = "some text\n```\ncode\n```\nmore text"
+        self.assertEqual(
+            markdown_to_blocks(md), ["some text", "```\ncode\n```", "more text"]
+        )
+
+    def test_indented_fence_is_not_code(self):
+        md = "# T\n\n  ```\nx\n\n y\n  ```"
+        self.assertEqual(markdown_to_blocks(md), ["# T", "  ```\nx", " y\n  ```"])
+        html = render_page(md, "{{ Content }}", "/")
+        self.assertNotIn("<pre>", html)
+
+    def test_whitespace_lines_separate_blocks(self):
+        self.assertEqual(markdown_to_blocks("a\n   \n\n\nb\n"), ["a", "b"])
+
+    def test_unclosed_fence_runs_to_end(self):
+        self.assertEqual(markdown_to_blocks("```\na\n\nb"), ["```\na\n\nb"])
+
+    def test_reads_file_lines_lazily(self):
+        lines = iter(["# Title\n", "\n", "para\n", "\n", "never read\n"])
+        reader = MarkdownReader(lines)
+        self.assertEqual(reader.read_title(), "Title")
+        blocks = iter(reader)
+        self.assertEqual(next(blocks), "# Title")
+        self.assertEqual(next(blocks), "para")
+        self.assertEqual(next(lines), "never read\n")
+
+    def test_title_ignores_fenced_lines(self):
+        reader = MarkdownReader.from_string("```\n# comment\n```\n\n## Real title")
+        self.assertEqual(reader.read_title(), "# Real title")
+        self.assertEqual(list(reader), ["```\n# comment\n```", "## Real title"])
+
+    def test_no_title(self):
+        self.assertRaises(ValueError, MarkdownReader.from_string("text").read_title)
+
+    def test_iter_blocks_from_file(self):
+        self.assertEqual(list(iter_blocks(StringIO("a\nb\n\nc\n"))), ["a\nb", "c"])
+
+    def test_render_page_with_blank_lines_in_code(self):
+        html = render_page("# T\n\n```\na\n\nb\n```", "{{ Content }}", "/")
+        self.assertEqual(html, "<div><h1>T</h1><pre><code>a\n\nb\n</code></pre></div>")
+
+    def test_front_matter(self):
+        reader = MarkdownReader.from_string(
+            "---\ntitle: Tom\ntags: [a, b]\n---\n# Heading\n\ntext"
+        )
+        self.assertEqual(reader.read_title(), "Tom")
+        self.assertEqual(reader.metadata, {"title": "Tom", "tags": ["a", "b"]})
+        self.assertEqual(list(reader), ["# Heading", "text"])
+
+    def test_front_matter_without_title(self):
+        reader = MarkdownReader.from_string("+++\ndraft = true\n+++\n\n# Heading")
+        self.assertEqual(reader.read_title(), "Heading")
+        self.assertEqual(reader.metadata, {"draft": True})
+
+    def test_unclosed_front_matter(self):
+        reader = MarkdownReader.from_string("+++\ntitle = 'a'\n\n# b")
+        self.assertRaisesRegex(ValueError, "no closing", reader.read_title)
+
+    def test_leading_rule_is_markdown(self):
+        cases = {
+            "---\ntitle: a\n\n# b": ["---\ntitle: a", "# b"],
+            "---\n\n# b\n\n---\n\ntext": ["---", "# b", "---", "text"],
+        }
+        for md, blocks in cases.items():
+            reader = MarkdownReader.from_string(md)
+            self.assertEqual(reader.read_title(), "b")
+            self.assertEqual(reader.metadata, {})
+            self.assertEqual(list(reader), blocks)
+
+    def test_invalid_toml_front_matter(self):
+        reader = MarkdownReader.from_string("+++\nnot toml\n+++\n# b")
+        self.assertRaisesRegex(ValueError, "Invalid front matter", reader.read_title)
+
+    def test_thematic_break_later_is_not_front_matter(self):
+        reader = MarkdownReader.from_string("# T\n\n---\n\nx")
+        self.assertEqual(reader.read_title(), "T")
+        self.assertEqual(list(reader), ["# T", "---", "x"])
+
+    def test_scan_metadata_reads_only_the_head(self):
+        lines = iter(["---\n", "title: T\n", "---\n", "never read\n"])
+        reader = MarkdownReader(lines)
+        self.assertEqual(reader.read_metadata(), {"title": "T"})
+        self.assertEqual(next(lines), "never read\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "a.md"
+            path.write_text("---\ndraft: true\n---\n# A\n\nbody")
+            self.assertEqual(scan_metadata(path), {"draft": True, "title": "A"})
+            self.assertTrue(is_draft(path))
+            path.write_text("no title")
+            self.assertEqual(scan_metadata(path), {"title": None})
+            self.assertFalse(is_draft(path))
+
+    def test_metadata_in_template(self):
+        html = render_page(
+            "---\ndate: 2024-05-01\ntags: [a, b]\n---\n# T",
+            "{{ Title }} {{ date }} {{ tags }}",
+            "/",
+        )
+        self.assertEqual(html, "T 2024-05-01 a, b")
+
+
+if __name__ == "__main__":
+    unittest.main()
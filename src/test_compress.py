@@ -0,0 +1,88 @@
+import gzip
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.compress import minify_html, postprocess, process_file
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.docs = self.root / "docs"
+        (self.docs / "blog").mkdir(parents=True)
+        self.page = self.docs / "blog" / "index.html"
+        self.page.write_text("<html>\n  <body>\n    <p>a   b</p>\n  </body>\n</html>\n")
+        (self.docs / "index.css").write_text("body {}")
+        (self.docs / "a.png").write_bytes(b"png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def postprocess(self, root=None, previous=None):
+        with redirect_stdout(StringIO()):
+            return postprocess(root or self.docs, previous)
+
+    def test_minify_html(self):
+        html = (
+            "<div>\n   <p>a  <!-- note -->  b</p>\n"
+            "<pre><code>x\n\n    y</code></pre> <code>a  b</code>\n</div>"
+        )
+        self.assertEqual(
+            minify_html(html),
+            "<div>\n<p>a b</p>\n<pre><code>x\n\n    y</code></pre> <code>a  b</code>\n</div>",
+        )
+
+    def test_writes_gzip_siblings(self):
+        counts = self.postprocess()
+        self.assertEqual(counts["compressed"], 2)
+        self.assertFalse((self.docs / "a.png.gz").exists())
+        minified = "<html>\n<body>\n<p>a b</p>\n</body>\n</html>\n"
+        self.assertEqual(self.page.read_text(), minified)
+        self.assertEqual(
+            gzip.decompress((self.docs / "blog" / "index.html.gz").read_bytes()),
+            minified.encode(),
+        )
+
+    def test_unchanged_outputs_are_skipped(self):
+        self.postprocess()
+        self.assertEqual(self.postprocess()["unchanged"], 2)
+        self.page.write_text("<p>new</p>")
+        counts = self.postprocess()
+        self.assertEqual((counts["compressed"], counts["unchanged"]), (1, 1))
+        self.assertEqual(
+            gzip.decompress((self.docs / "blog" / "index.html.gz").read_bytes()),
+            b"<p>new</p>",
+        )
+
+    def test_identical_outputs_reuse_previous_siblings(self):
+        self.postprocess()
+        staging = self.root / "staging"
+        (staging / "blog").mkdir(parents=True)
+        (staging / "blog" / "index.html").write_text(self.page.read_text())
+        (staging / "index.css").write_text("body { color: red }")
+        counts = self.postprocess(staging, self.docs)
+        self.assertEqual((counts["linked"], counts["compressed"]), (1, 1))
+        self.assertEqual(
+            os.stat(staging / "blog" / "index.html.gz").st_ino,
+            os.stat(self.docs / "blog" / "index.html.gz").st_ino,
+        )
+
+    def test_orphans_are_removed(self):
+        self.postprocess()
+        self.page.unlink()
+        self.assertEqual(self.postprocess()["removed"], 1)
+        self.assertFalse((self.docs / "blog" / "index.html.gz").exists())
+
+    def test_no_minify(self):
+        before = self.page.read_text()
+        self.assertEqual(process_file(self.page, minify=False), "compressed")
+        self.assertEqual(self.page.read_text(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
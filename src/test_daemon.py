@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.blockcache import disable_block_cache
+from static_site.highlight import disable_highlight_cache
+from static_site.client import request
+from static_site.daemon import Daemon, DaemonServer
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "static").mkdir()
+        (self.root / "content" / "blog").mkdir(parents=True)
+        (self.root / "templates").mkdir()
+        (self.root / "content" / "index.md").write_text("# Home\n\n[a](/blog)")
+        (self.root / "content" / "blog" / "index.md").write_text("# Blog")
+        (self.root / "template.html").write_text("<h1>{{ Title }}</h1>{{ Content }}")
+        (self.root / "templates" / "blog.html").write_text("blog: {{ Title }}")
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        self.socket = self.root / "daemon.sock"
+        self.daemon = Daemon(cache_dir=".cache")
+        self.server = DaemonServer(self.socket, self.daemon)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        os.chdir(self.cwd)
+        disable_block_cache()
+        disable_highlight_cache()
+        self.tmp.cleanup()
+
+    def send(self, **payload) -> dict:
+        return request(payload, self.socket, timeout=10)
+
+    def test_ping(self):
+        response = self.send(op="ping")
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["pid"], os.getpid())
+
+    def test_render_markdown(self):
+        response = self.send(
+            op="render",
+            markdown="# Hi\n\n[a](/b)",
+            template="<h1>{{ Title }}</h1>{{ Content }}",
+            basepath="/site/",
+        )
+        self.assertEqual(
+            response["html"],
+            '<h1>Hi</h1><div><h1>Hi</h1><p><a href="/site/b">a</a></p></div>',
+        )
+
+    def test_render_path_uses_site_templates(self):
+        response = self.send(op="render", path="content/index.md")
+        self.assertEqual(
+            response["html"],
+            '<h1>Home</h1><div><h1>Home</h1><p><a href="/blog">a</a></p></div>',
+        )
+        response = self.send(op="render", path="content/blog/index.md")
+        self.assertEqual(response["html"], "blog: Blog")
+
+    def test_errors_are_responses(self):
+        response = self.send(op="render", path="content/missing.md")
+        self.assertFalse(response["ok"])
+        self.assertIn("FileNotFoundError", response["error"])
+        response = self.send(op="explode")
+        self.assertEqual(
+            response, {"ok": False, "error": "ValueError: Unknown op: 'explode'"}
+        )
+        self.assertTrue(self.send(op="ping")["ok"])
+
+    def test_build_reuses_warm_state(self):
+        response = self.send(op="build", incremental=True)
+        self.assertTrue(response["ok"])
+        self.assertIn("Rendered 2/2 pages", response["output"])
+        self.assertEqual(
+            (self.root / "docs" / "blog" / "index.html").read_text(), "blog: Blog"
+        )
+        response = self.send(op="build", incremental=True)
+        self.assertIn("Rendered 0/2 pages", response["output"])
+        stats = self.send(op="stats")
+        self.assertEqual(stats["pages"], 2)
+        self.assertEqual(stats["requests"], 3)
+
+    def test_save(self):
+        self.send(op="build")
+        with redirect_stdout(StringIO()):
+            self.daemon.save()
+        for name in ("files.json", "metadata.json", "blocks.json"):
+            self.assertTrue((self.root / ".cache" / name).is_file(), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from static_site.depgraph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def test_dependents(self):
+        graph = DependencyGraph(
+            {
+                "index.html": ["content/index.md", "template.html"],
+                "blog/index.html": ["content/blog/index.md", "templates/blog.html"],
+            }
+        )
+        self.assertEqual(graph.dependents(["template.html"]), {"index.html"})
+        self.assertEqual(
+            graph.dependents(["templates/blog.html", "content/index.md"]),
+            {"index.html", "blog/index.html"},
+        )
+        self.assertEqual(graph.dependents(["nothing.html"]), set())
+
+    def test_record_replaces_and_forget_removes(self):
+        graph = DependencyGraph()
+        graph.record("index.html", ["content/index.md", "template.html"])
+        graph.record("index.html", ["content/index.md", "templates/home.html"])
+        self.assertEqual(graph.dependents(["template.html"]), set())
+        self.assertEqual(graph.dependents(["templates/home.html"]), {"index.html"})
+        graph.forget("index.html")
+        self.assertIsNone(graph.dependencies("index.html"))
+        self.assertEqual(graph.dependents(["content/index.md"]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from static_site.discovery import FileIndex, discover, is_ignored
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "content"
+        for rel in (
+            "index.md",
+            "blog/a/index.md",
+            "blog/b.md",
+            "blog/notes.txt",
+            "blog/drafts/c.md",
+            "_partials/nav.md",
+        ):
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text("# x")
+        self.age(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def age(self, *paths):
+        # listings of just modified directories are never reused
+        old = time.time() - 60
+        for path in paths:
+            for p in (path, *path.rglob("*")):
+                os.utime(p, (old, old))
+
+    def test_order_suffix_and_ignore(self):
+        self.assertEqual(
+            discover(self.root, ".md"),
+            [
+                "_partials/nav.md",
+                "blog/a/index.md",
+                "blog/b.md",
+                "blog/drafts/c.md",
+                "index.md",
+            ],
+        )
+        self.assertEqual(
+            discover(self.root, ".md", ignore=("drafts", "_*")),
+            ["blog/a/index.md", "blog/b.md", "index.md"],
+        )
+        self.assertIn("blog/notes.txt", discover(self.root))
+
+    def test_is_ignored(self):
+        self.assertTrue(is_ignored("blog/drafts", ["drafts"]))
+        self.assertTrue(is_ignored("blog/b.md", ["blog/*.md"]))
+        self.assertFalse(is_ignored("blog/b.md", ["*.txt"]))
+
+    def test_index_reuses_unchanged_directories(self):
+        index = FileIndex()
+        first = discover(self.root, ".md", index=index)
+        self.assertEqual(index.reused, 0)
+        path = Path(self.tmp.name) / "index.json"
+        index.save(path)
+        index = FileIndex.load(path)
+        self.assertEqual(discover(self.root, ".md", index=index), first)
+        self.assertEqual(index.reused, 5)
+
+        (self.root / "blog" / "b.md").unlink()
+        (self.root / "blog" / "a" / "new.md").write_text("# y")
+        index.scanned = index.reused = 0
+        found = discover(self.root, ".md", index=index)
+        self.assertIn("blog/a/new.md", found)
+        self.assertNotIn("blog/b.md", found)
+        self.assertEqual(index.scanned, 2)
+
+    def test_ignored_and_removed_directories_are_forgotten(self):
+        index = FileIndex()
+        discover(self.root, ".md", index=index)
+        discover(self.root, ".md", ignore=("blog",), index=index)
+        self.assertNotIn("blog", index.dirs)
+
+    def test_unreadable_index_is_empty(self):
+        path = Path(self.tmp.name) / "index.json"
+        path.write_text("{broken")
+        self.assertEqual(FileIndex.load(path).dirs, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from static_site.frontmatter import as_context, parse_front_matter
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_yaml(self):
+        lines = [
+            "title: 'Why Tom: a mistake'",
+            "date: 2024-05-01",
+            "draft: false",
+            "weight: 3",
+            "tags: [tolkien, opinion]",
+            "authors:",
+            "  - Frodo",
+            "  - Sam",
+            "# a comment",
+        ]
+        self.assertEqual(
+            parse_front_matter("---", lines),
+            {
+                "title": "Why Tom: a mistake",
+                "date": "2024-05-01",
+                "draft": False,
+                "weight": 3,
+                "tags": ["tolkien", "opinion"],
+                "authors": ["Frodo", "Sam"],
+            },
+        )
+
+    def test_toml(self):
+        lines = ['title = "Tom"', "draft = true", 'tags = ["a", "b"]']
+        self.assertEqual(
+            parse_front_matter("+++", lines),
+            {"title": "Tom", "draft": True, "tags": ["a", "b"]},
+        )
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            parse_front_matter("---", ["title: a", "not a pair"])
+        with self.assertRaisesRegex(ValueError, "Invalid front matter"):
+            parse_front_matter("+++", ["title = "])
+
+    def test_as_context(self):
+        self.assertEqual(
+            as_context({"tags": ["a", 1], "draft": True, "title": "x"}),
+            {"tags": "a, 1", "draft": "true", "title": "x"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
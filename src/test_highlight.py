@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from static_site.functions import markdown_to_html_node, parse_code_block
+from static_site.highlight import (
+    HighlightCache,
+    compile_lexer,
+    disable_highlight_cache,
+    enable_highlight_cache,
+    highlight,
+    highlight_cached,
+)
+
+
+class TestHighlight(unittest.TestCase):
+    def test_python(self):
+        self.assertEqual(
+            highlight('def f(x):\n    return "<b>" # done', "python"),
+            '<span class="k">def</span> f(x):\n    <span class="k">return</span> '
+            '<span class="s">"&lt;b&gt;"</span> <span class="c"># done</span>',
+        )
+
+    def test_earlier_rules_win(self):
+        # keywords inside strings and comments stay part of them
+        self.assertEqual(
+            highlight("// if true\nx = 'if'", "js"),
+            '<span class="c">// if true</span>\nx = <span class="s">\'if\'</span>',
+        )
+
+    def test_unknown_language_is_escaped(self):
+        self.assertEqual(highlight("a < b && c", "brainfuck"), "a &lt; b &amp;&amp; c")
+        self.assertEqual(highlight("<x>"), "&lt;x&gt;")
+
+    def test_aliases(self):
+        self.assertIs(compile_lexer("py"), compile_lexer("python"))
+        self.assertIn('<span class="nv">$HOME</span>', highlight("cd $HOME", "sh"))
+
+    def test_parse_code_block(self):
+        self.assertEqual(parse_code_block("```py\nx = 1\n```"), ("py", "x = 1\n"))
+        self.assertEqual(parse_code_block("```\nx\n```"), ("", "x\n"))
+        self.assertEqual(parse_code_block("```python title=a\nx```"), ("python", "x"))
+        self.assertEqual(parse_code_block('```a"b\nx\n```'), ("", "x\n"))
+
+    def test_code_block_keeps_language(self):
+        html = markdown_to_html_node("```Python\nNone\n```").to_html()
+        self.assertEqual(
+            html,
+            '<div><pre><code class="language-Python">'
+            '<span class="kc">None</span>\n</code></pre></div>',
+        )
+
+
+class TestHighlightCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name) / "highlight"
+
+    def tearDown(self):
+        disable_highlight_cache()
+        self.tmp.cleanup()
+
+    def test_unchanged_code_is_lexed_once(self):
+        cache = enable_highlight_cache(self.directory)
+        first = highlight_cached("x = 1", "python")
+        self.assertEqual(first, highlight("x = 1", "python"))
+        self.assertEqual(cache.take_stats(), (0, 1))
+        # a later build, with a cache of its own over the same directory
+        cache = enable_highlight_cache(self.directory)
+        self.assertEqual(highlight_cached("x = 1", "PY"), first)
+        self.assertEqual(highlight_cached("x = 2", "python").count("span"), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertEqual(highlight_cached("x = 1", "python"), first)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(list(self.directory.rglob("*.html"))), 3)
+
+    def test_content_addressed(self):
+        key = HighlightCache.key("x", "python")
+        self.assertEqual(key, HighlightCache.key("x", "python"))
+        self.assertNotEqual(key, HighlightCache.key("x", "go"))
+        self.assertNotEqual(key, HighlightCache.key("y", "python"))
+
+    def test_plain_code_skips_the_cache(self):
+        cache = enable_highlight_cache(self.directory)
+        self.assertEqual(highlight_cached("<x>", "text"), "&lt;x&gt;")
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertFalse(self.directory.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
+import pickle
 import unittest
+from io import StringIO
 
-from functions import markdown_to_html_node
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from static_site.functions import markdown_to_html_node
+from static_site.htmlnode import HTMLNode, LeafNode, ParentNode
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -20,6 +22,18 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode("div", props={"class": "container"})
         self.assertEqual(node.props["class"], "container")
 
+    def test_leaves_share_empty_containers(self):
+        first, second = LeafNode("b", "x"), LeafNode(None, "y")
+        self.assertIs(first.props, second.props)
+        self.assertIs(first.children, second.children)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def test_pickle(self):
+        node = ParentNode("p", [LeafNode("a", "x", {"href": "/"}), LeafNode("b", "y")])
+        copy = pickle.loads(pickle.dumps(node))
+        self.assertEqual(copy.to_html(), node.to_html())
+        self.assertIs(copy.children[1].props, LeafNode("b", "z").props)
+
     def test_paragraphs(self):
         md = """
 This is **bolded** paragraph
@@ -52,6 +66,30 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
 
+    def test_basepath_rewrites_links_and_images(self):
+        md = "[home](/index.html) ![cat](/images/cat.png) [ext](https://x.dev/)"
+        html = markdown_to_html_node(md, basepath="/site/").to_html()
+        self.assertEqual(
+            html,
+            '<div><p><a href="/site/index.html">home</a> '
+            '<img src="/site/images/cat.png" alt="cat"></img> '
+            '<a href="https://x.dev/">ext</a></p></div>',
+        )
+
+    def test_basepath_leaves_literal_text_alone(self):
+        md = """
+Write `<a href="/x">` for links
+
+```
+<img src="/a.png">
+```
+"""
+        html = markdown_to_html_node(md, basepath="/site/").to_html()
+        self.assertIn('href="/x"', html)
+        self.assertNotIn("/site/x", html)
+        self.assertIn('src="/a.png"', html)
+        self.assertNotIn("/site/a.png", html)
+
 
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_p(self):
@@ -102,6 +140,22 @@ class TestParentNode(unittest.TestCase):
         parent_node = ParentNode(None, None)
         self.assertRaises(ValueError, parent_node.to_html)
 
+    def test_iter_html(self):
+        parent_node = ParentNode(
+            "div", [ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, "text")])]
+        )
+        chunks = list(parent_node.iter_html())
+        self.assertEqual(
+            chunks, ["<div>", "<p>", "<b>bold</b>", "text", "</p>", "</div>"]
+        )
+        self.assertEqual("".join(chunks), parent_node.to_html())
+
+    def test_write_html(self):
+        parent_node = ParentNode("div", [LeafNode("a", "x", {"href": "/y"})])
+        buffer = StringIO()
+        parent_node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), '<div><a href="/y">x</a></div>')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,182 @@
+import struct
+import tempfile
+import unittest
+import zlib
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site import images
+from static_site.images import ResponsiveImages, image_size
+
+
+def png(width: int, height: int) -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data)
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    pixels = zlib.compress(b"".join(b"\0" + b"\x80" * width for _ in range(height)))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", pixels)
+        + chunk(b"IEND", b"")
+    )
+
+
+class TestImageSize(unittest.TestCase):
+    def size(self, data: bytes):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            return image_size(f.name)
+
+    def test_png(self):
+        self.assertEqual(self.size(png(3, 2)), (3, 2))
+
+    def test_gif(self):
+        self.assertEqual(
+            self.size(b"GIF89a" + struct.pack("<HH", 640, 480)), (640, 480)
+        )
+
+    def test_jpeg(self):
+        data = (
+            b"\xff\xd8"
+            + b"\xff\xe0"
+            + struct.pack(">H", 6)
+            + b"JFIF"
+            + b"\xff\xc0"
+            + struct.pack(">HBHH", 11, 8, 300, 400)
+            + b"\x03"
+        )
+        self.assertEqual(self.size(data), (400, 300))
+
+    def test_webp(self):
+        lossless = b"RIFF\0\0\0\0WEBPVP8L\0\0\0\0\x2f"
+        bits = (200 - 1) | ((100 - 1) << 14)
+        data = lossless + struct.pack("<I", bits) + b"\0" * 5
+        self.assertEqual(self.size(data), (200, 100))
+
+    def test_unknown(self):
+        self.assertIsNone(self.size(b"not an image at all"))
+
+
+class TestResponsiveImages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "docs"
+        self.cache_dir = Path(self.tmp.name) / "cache"
+        (self.root / "images").mkdir(parents=True)
+        (self.root / "blog").mkdir()
+        (self.root / "images" / "cat.png").write_bytes(png(1200, 600))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def page(self, html: str, name="blog/index.html") -> Path:
+        path = self.root / name
+        path.write_text(html)
+        return path
+
+    def process(self, responsive: ResponsiveImages, basepath="/site/") -> dict:
+        with redirect_stdout(StringIO()):
+            return responsive.process(self.root, basepath)
+
+    def test_dimensions_without_variants(self):
+        page = self.page(
+            '<p><img src="/site/images/cat.png" alt="A &amp; B"></img></p>'
+            '<img src="https://x.dev/a.png"><img src="../images/cat.png" width="5">'
+        )
+        responsive = ResponsiveImages(self.cache_dir, widths=(10000,), lazy=False)
+        counts = self.process(responsive)
+        self.assertEqual(counts["pages"], 1)
+        self.assertEqual(
+            page.read_text(),
+            '<p><img src="/site/images/cat.png" alt="A &amp; B" width="1200" '
+            'height="600" data-responsive></img></p>'
+            '<img src="https://x.dev/a.png"><img src="../images/cat.png" width="5">',
+        )
+        # already up to date
+        self.assertEqual(self.process(responsive)["pages"], 0)
+
+    def test_relative_src_and_lazy(self):
+        page = self.page('<img alt=cat src="../images/cat.png" />')
+        self.process(ResponsiveImages(None, widths=()))
+        self.assertEqual(
+            page.read_text(),
+            '<img alt="cat" src="../images/cat.png" width="1200" height="600" '
+            'loading="lazy" decoding="async" data-responsive>',
+        )
+
+    def test_index_remembers_images(self):
+        responsive = ResponsiveImages(self.cache_dir, widths=())
+        self.assertEqual(self.process(responsive)["read"], 1)
+        responsive.save()
+        responsive = ResponsiveImages(self.cache_dir, widths=())
+        self.assertEqual(self.process(responsive)["read"], 0)
+        (self.root / "images" / "cat.png").write_bytes(png(10, 20))
+        self.assertEqual(self.process(responsive)["read"], 1)
+        (self.root / "images" / "cat.png").unlink()
+        self.process(responsive)
+        self.assertEqual(responsive.sources, {})
+
+    def test_changed_image_updates_the_pages_showing_it(self):
+        (self.root / "images" / "dog.png").write_bytes(png(100, 50))
+        page = self.page('<img src="/site/images/dog.png">')
+        other = self.page('<img src="/site/images/cat.png">', "index.html")
+        responsive = ResponsiveImages(self.cache_dir, widths=(), lazy=False)
+        self.process(responsive)
+        responsive.save()
+        before = other.stat().st_mtime_ns
+        (self.root / "images" / "dog.png").write_bytes(png(300, 200))
+        responsive = ResponsiveImages(self.cache_dir, widths=(), lazy=False)
+        self.assertEqual(self.process(responsive)["pages"], 1)
+        self.assertEqual(
+            page.read_text(),
+            '<img src="/site/images/dog.png" width="300" height="200" data-responsive>',
+        )
+        self.assertEqual(other.stat().st_mtime_ns, before)
+
+    def test_only_pages_written_since_are_read(self):
+        page = self.page('<img src="/site/images/cat.png">')
+        responsive = ResponsiveImages(self.cache_dir, widths=())
+        self.process(responsive)
+        page.write_text("hand edited, so not read again")
+        responsive.pages["blog/index.html"][:2] = [
+            page.stat().st_size,
+            page.stat().st_mtime_ns,
+        ]
+        self.assertEqual(self.process(responsive)["pages"], 0)
+        # the build writes the page again
+        self.page('<p><img src="/site/images/cat.png"></p>')
+        self.assertEqual(self.process(responsive)["pages"], 1)
+        self.assertIn('width="1200"', page.read_text())
+
+    def test_hand_sized_tags_are_left_alone(self):
+        tag = '<img src="/site/images/cat.png" srcset="/site/images/cat.png 2x">'
+        page = self.page(tag)
+        self.process(ResponsiveImages(None, widths=()))
+        self.assertEqual(page.read_text(), tag)
+
+    @unittest.skipIf(images.Image is None, "Pillow is not installed")
+    def test_variants_are_made_once(self):
+        page = self.page('<img src="/site/images/cat.png">')
+        responsive = ResponsiveImages(self.cache_dir, widths=(300, 600, 2000))
+        counts = self.process(responsive)
+        self.assertEqual((counts["made"], counts["reused"]), (2, 0))
+        self.assertEqual(image_size(self.root / "images" / "cat-300w.png"), (300, 150))
+        self.assertIn(
+            'srcset="/site/images/cat-300w.png 300w, /site/images/cat-600w.png 600w, '
+            '/site/images/cat.png 1200w" sizes="(max-width: 1200px) 100vw, 1200px"',
+            page.read_text(),
+        )
+        # a fresh output tree, as a full build makes, reuses the derivatives
+        (self.root / "images" / "cat-300w.png").unlink()
+        counts = self.process(ResponsiveImages(self.cache_dir, widths=(300, 600, 2000)))
+        self.assertEqual((counts["made"], counts["reused"]), (0, 2))
+        self.assertTrue((self.root / "images" / "cat-300w.png").is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
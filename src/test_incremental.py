@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from static_site.incremental import MANIFEST_NAME, Manifest, build_incremental
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.static = self.root / "static"
+        self.content = self.root / "content"
+        self.docs = self.root / "docs"
+        self.template = self.root / "template.html"
+        (self.static / "images").mkdir(parents=True)
+        (self.content / "blog").mkdir(parents=True)
+        (self.static / "index.css").write_text("body {}")
+        (self.static / "images" / "a.png").write_bytes(b"png")
+        (self.content / "index.md").write_text("# Home\n\nhello")
+        (self.content / "blog" / "index.md").write_text("# Blog\n\nposts")
+        self.template.write_text(TEMPLATE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, basepath="/"):
+        with redirect_stdout(StringIO()) as out:
+            build_incremental(
+                self.static, self.content, self.template, self.docs, basepath
+            )
+        return out.getvalue()
+
+    def test_first_build_renders_everything(self):
+        out = self.build()
+        self.assertIn("Rendered 2/2 pages, copied 2/2 assets", out)
+        self.assertIn("<main>", (self.docs / "blog" / "index.html").read_text())
+        manifest = Manifest.load(self.docs / MANIFEST_NAME)
+        self.assertEqual(sorted(manifest.pages), ["blog/index.md", "index.md"])
+
+    def test_unchanged_build_does_nothing(self):
+        self.build()
+        out = self.build()
+        self.assertIn("Rendered 0/2 pages, copied 0/2 assets", out)
+
+    def test_unchanged_files_are_not_hashed(self):
+        self.build()
+        with mock.patch(
+            "static_site.incremental.hash_file", side_effect=AssertionError
+        ):
+            self.assertIn("Rendered 0/2 pages, copied 0/2 assets", self.build())
+        # a touched file is hashed again, but isn't rendered when unchanged
+        os.utime(self.content / "index.md")
+        self.assertIn("Rendered 0/2 pages", self.build())
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        (self.content / "blog" / "index.md").write_text("# Blog\n\nnew posts")
+        out = self.build()
+        self.assertIn("Rendered 1/2 pages", out)
+        self.assertIn("new posts", (self.docs / "blog" / "index.html").read_text())
+
+    def test_template_or_basepath_change_renders_everything(self):
+        self.build()
+        self.template.write_text(TEMPLATE + "<footer></footer>")
+        self.assertIn("Rendered 2/2 pages", self.build())
+        self.assertIn("Rendered 2/2 pages", self.build("/site/"))
+
+    def test_renderer_change_renders_everything(self):
+        self.build()
+        with mock.patch(
+            "static_site.incremental.renderer_version", return_value="other"
+        ):
+            self.assertIn("Rendered 2/2 pages", self.build())
+
+    def test_partial_change_renders_only_dependent_pages(self):
+        self.build()
+        templates = self.root / "templates"
+        (templates / "partials").mkdir(parents=True)
+        (templates / "partials" / "nav.html").write_text("<nav></nav>")
+        (templates / "blog.html").write_text("{{> nav }}{{ Content }}")
+        self.assertIn("Rendered 1/2 pages", self.build())
+        (templates / "partials" / "nav.html").write_text("<nav>blog</nav>")
+        out = self.build()
+        self.assertIn("Rendered 1/2 pages", out)
+        self.assertIn("blog/index.md", out)
+        self.assertIn(
+            "<nav>blog</nav>", (self.docs / "blog" / "index.html").read_text()
+        )
+        manifest = Manifest.load(self.docs / MANIFEST_NAME)
+        self.assertEqual(
+            manifest.graph.dependents([str(templates / "partials" / "nav.html")]),
+            {"blog/index.html"},
+        )
+
+    def test_drafts_are_left_out(self):
+        (self.content / "blog" / "index.md").write_text("---\ndraft: true\n---\n# B")
+        with redirect_stdout(StringIO()) as out:
+            build_incremental(
+                self.static, self.content, self.template, self.docs, "/", drafts=False
+            )
+        self.assertIn("Rendered 1/1 pages", out.getvalue())
+        self.assertFalse((self.docs / "blog" / "index.html").exists())
+
+    def test_removed_sources_are_deleted(self):
+        self.build()
+        (self.content / "blog" / "index.md").unlink()
+        (self.static / "images" / "a.png").unlink()
+        out = self.build()
+        self.assertIn("removed 2 stale files", out)
+        self.assertFalse((self.docs / "blog").exists())
+        self.assertFalse((self.docs / "images").exists())
+        self.assertTrue((self.docs / "index.css").exists())
+
+    def test_corrupt_manifest_is_a_full_build(self):
+        self.build()
+        (self.docs / MANIFEST_NAME).write_text("{not json")
+        self.assertIn("Rendered 2/2 pages", self.build())
+
+
+if __name__ == "__main__":
+    unittest.main()
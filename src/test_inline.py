@@ -0,0 +1,95 @@
+import unittest
+
+from static_site.inline import (
+    DEFAULT_SCANNER,
+    compile_scanner,
+    tokenize_inline,
+    tokenize_nodes,
+)
+from static_site.textnode import TextNode, TextType
+
+
+class TestInline(unittest.TestCase):
+    def test_underscore_in_link_url(self):
+        self.assertListEqual(
+            tokenize_inline("see [docs](https://example.com/some_long_path) _now_"),
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "https://example.com/some_long_path"),
+                TextNode(" ", TextType.TEXT),
+                TextNode("now", TextType.ITALIC),
+            ],
+        )
+
+    def test_underscore_in_image_url(self):
+        self.assertListEqual(
+            tokenize_inline("![a cat](/images/my_cat_photo.png)"),
+            [TextNode("a cat", TextType.IMAGE, "/images/my_cat_photo.png")],
+        )
+
+    def test_code_is_not_split(self):
+        self.assertListEqual(
+            tokenize_inline("call `snake_case_name` **now**"),
+            [
+                TextNode("call ", TextType.TEXT),
+                TextNode("snake_case_name", TextType.CODE),
+                TextNode(" ", TextType.TEXT),
+                TextNode("now", TextType.BOLD),
+            ],
+        )
+
+    def test_token_content_is_not_reparsed(self):
+        self.assertListEqual(
+            tokenize_inline("**bold _not italic_**"),
+            [TextNode("bold _not italic_", TextType.BOLD)],
+        )
+
+    def test_unclosed_delimiter_is_text(self):
+        self.assertListEqual(
+            tokenize_inline("2 ** 3 is eight"),
+            [TextNode("2 ** 3 is eight", TextType.TEXT)],
+        )
+
+    def test_multiline(self):
+        self.assertListEqual(
+            tokenize_inline("a **bold\nword** b"),
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("bold\nword", TextType.BOLD),
+                TextNode(" b", TextType.TEXT),
+            ],
+        )
+
+    def test_tokenize_nodes_skips_non_text(self):
+        nodes = [
+            TextNode("**kept**", TextType.CODE),
+            TextNode("a *b*", TextType.TEXT),
+        ]
+        self.assertListEqual(
+            tokenize_nodes(nodes, (("*", TextType.ITALIC),), images=False),
+            [
+                TextNode("**kept**", TextType.CODE),
+                TextNode("a ", TextType.TEXT),
+                TextNode("b", TextType.ITALIC),
+            ],
+        )
+
+    def test_scanner_kinds(self):
+        self.assertIs(compile_scanner(), DEFAULT_SCANNER)
+        scanner = compile_scanner((("~~", TextType.CODE),), images=False)
+        self.assertDictEqual(
+            scanner.kinds, {"link_url": TextType.LINK, "d0": TextType.CODE}
+        )
+        self.assertListEqual(
+            tokenize_inline("a ~~b~~ ![c](d)", (("~~", TextType.CODE),), images=False),
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("b", TextType.CODE),
+                TextNode(" !", TextType.TEXT),
+                TextNode("c", TextType.LINK, "d"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from static_site import instrument
+from static_site.blockstream import MarkdownReader
+from static_site.functions import render_page
+from static_site.instrument import (
+    Profiler,
+    enable_profiling,
+    disable_profiling,
+    log,
+    set_quiet,
+)
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        disable_profiling()
+        set_quiet(False)
+
+    def test_nested_stages_are_exclusive(self):
+        profiler = Profiler()
+        with profiler.stage("outer"):
+            time.sleep(0.01)
+            with profiler.stage("inner"):
+                time.sleep(0.02)
+        self.assertGreaterEqual(profiler.stages["inner"], 0.02)
+        self.assertLess(profiler.stages["outer"], 0.02)
+
+    def test_merge_and_report(self):
+        profiler = Profiler()
+        profiler.merge(({"read": 1.0}, {"a.md": 1.0}))
+        profiler.merge(({"read": 1.0, "write": 2.0}, {"b.md": 3.0}))
+        self.assertEqual(profiler.stages, {"read": 2.0, "write": 2.0})
+        report = profiler.report(slowest=1)
+        self.assertIn("read", report)
+        self.assertIn("50.0%", report)
+        self.assertIn("b.md", report)
+        self.assertNotIn("a.md", report)
+
+    def test_render_stages(self):
+        profiler = enable_profiling()
+        html = render_page("# Title\n\n- a **b**", "{{ Title }}{{ Content }}", "/")
+        self.assertEqual(
+            html, "Title<div><h1>Title</h1><ul><li>a <b>b</b></li></ul></div>"
+        )
+        for name in ("blocks", "block_type", "inline", "tree", "serialize"):
+            self.assertIn(name, profiler.stages)
+
+    def test_lazy_reads_are_timed_as_read(self):
+        def slow_lines():
+            for line in ("# Title", "", "text"):
+                time.sleep(0.01)
+                yield line
+
+        profiler = enable_profiling()
+        render_page(MarkdownReader(slow_lines()), "{{ Content }}", "/")
+        self.assertGreaterEqual(profiler.stages["read"], 0.03)
+        self.assertLess(profiler.stages["blocks"], 0.03)
+
+    def test_stage_is_a_no_op_when_disabled(self):
+        self.assertIs(instrument.stage("read"), instrument.stage("write"))
+
+    def test_quiet(self):
+        with redirect_stdout(StringIO()) as out:
+            log("shown")
+            set_quiet()
+            log("hidden")
+        self.assertEqual(out.getvalue(), "shown\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
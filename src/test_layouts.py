@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from static_site.layouts import Layouts
+
+
+class TestLayouts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.content = self.root / "content"
+        self.templates = self.root / "templates"
+        (self.content / "blog" / "tom").mkdir(parents=True)
+        (self.templates / "partials").mkdir(parents=True)
+        (self.root / "template.html").write_text("{{> nav }}<main>{{ Content }}</main>")
+        (self.templates / "blog.html").write_text("{{> nav }}<article>{{ Content }}")
+        (self.templates / "partials" / "nav.html").write_text("<nav>{{> links }}</nav>")
+        (self.templates / "partials" / "links.html").write_text("<a>{{ Title }}</a>")
+        self.layouts = Layouts(self.root / "template.html", self.content)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_template_for_section(self):
+        self.assertEqual(
+            self.layouts.template_for(self.content / "index.md"),
+            self.root / "template.html",
+        )
+        self.assertEqual(
+            self.layouts.template_for(self.content / "blog" / "tom" / "index.md"),
+            self.templates / "blog.html",
+        )
+        (self.templates / "blog").mkdir()
+        (self.templates / "blog" / "tom.html").write_text("tom")
+        self.assertEqual(
+            self.layouts.template_for(self.content / "blog" / "tom" / "index.md"),
+            self.templates / "blog" / "tom.html",
+        )
+
+    def test_partials_are_expanded(self):
+        template = self.layouts.load(self.templates / "blog.html")
+        self.assertEqual(
+            template.render({"Title": "t", "Content": "c"}),
+            "<nav><a>t</a></nav><article>c",
+        )
+        self.assertEqual(
+            template.dependencies,
+            (
+                str(self.templates / "blog.html"),
+                str(self.templates / "partials" / "nav.html"),
+                str(self.templates / "partials" / "links.html"),
+            ),
+        )
+
+    def test_page_dependencies(self):
+        page = self.content / "index.md"
+        self.assertEqual(
+            self.layouts.dependencies(page),
+            [
+                str(page),
+                str(self.root / "template.html"),
+                str(self.templates / "partials" / "nav.html"),
+                str(self.templates / "partials" / "links.html"),
+            ],
+        )
+
+    def test_missing_partial(self):
+        (self.templates / "partials" / "nav.html").write_text("{{> footer }}")
+        with self.assertRaisesRegex(ValueError, "Partial not found"):
+            self.layouts.load(self.root / "template.html")
+
+    def test_partial_cycle(self):
+        (self.templates / "partials" / "links.html").write_text("{{> nav }}")
+        with self.assertRaisesRegex(ValueError, "Partial includes itself"):
+            self.layouts.load(self.root / "template.html")
+
+    def test_is_template_file(self):
+        self.assertTrue(self.layouts.is_template_file(self.root / "template.html"))
+        self.assertTrue(
+            self.layouts.is_template_file(self.templates / "partials" / "nav.html")
+        )
+        self.assertFalse(self.layouts.is_template_file(self.content / "index.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.incremental import build_incremental
+from static_site.layouts import Layouts
+from static_site.listings import Listings, generate_listings, page_url, slugify
+from static_site.metadata import MetadataIndex
+
+
+def post(date, tags="[]", draft="false"):
+    return f"---\ndate: {date}\ntags: {tags}\ndraft: {draft}\n---\n# Post {date}\n"
+
+
+class TestListings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.content = self.root / "content"
+        self.docs = self.root / "docs"
+        (self.root / "static").mkdir()
+        (self.root / "template.html").write_text("<h1>{{ Title }}</h1>{{ Content }}")
+        self.write("index.md", "# Home")
+        for day, tags in (("01", "[elves]"), ("02", "[elves, Rings]"), ("03", "[]")):
+            self.write(f"blog/p{day}/index.md", post(f"2024-01-{day}", tags))
+        self.write("blog/draft/index.md", post("2024-02-01", draft="true"))
+        self.layouts = Layouts(self.root / "template.html", self.content)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, text):
+        path = self.content / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def metadata(self):
+        metadata = MetadataIndex()
+        metadata.update(
+            self.content,
+            sorted(
+                p.relative_to(self.content).as_posix()
+                for p in self.content.rglob("*.md")
+            ),
+        )
+        return metadata
+
+    def build(self):
+        with redirect_stdout(StringIO()) as out:
+            build_incremental(
+                self.root / "static",
+                self.content,
+                self.layouts,
+                self.docs,
+                "/",
+                drafts=False,
+                listings=Listings(["blog"], per_page=2),
+            )
+        return out.getvalue()
+
+    def test_page_url_and_slugify(self):
+        self.assertEqual(page_url("blog/tom/index.md"), "/blog/tom")
+        self.assertEqual(page_url("index.md"), "/")
+        self.assertEqual(page_url("blog/a.md"), "/blog/a.html")
+        self.assertEqual(slugify("Lord of the Rings!"), "lord-of-the-rings")
+
+    def test_pages(self):
+        pages = Listings(["blog"], per_page=2).pages(self.metadata(), self.layouts)
+        self.assertEqual(
+            [page.output for page in pages],
+            [
+                "blog/index.html",
+                "blog/page/1/index.html",
+                "tags/elves/index.html",
+                "tags/rings/index.html",
+            ],
+        )
+        first, second = pages[:2]
+        self.assertEqual(
+            [post["url"] for post in first.posts], ["/blog/p03", "/blog/p02"]
+        )
+        self.assertEqual((first.newer, first.older), (None, "/blog/page/1"))
+        self.assertEqual((second.newer, second.older), ("/blog", None))
+        self.assertEqual(pages[3].title, "Posts tagged Rings")
+
+    def test_rendered_listing(self):
+        pages = Listings(["blog"], per_page=2).pages(self.metadata(), self.layouts)
+        with redirect_stdout(StringIO()):
+            generate_listings(pages[1:2], self.docs, self.layouts, "/site/")
+        self.assertEqual(
+            (self.docs / "blog" / "page" / "1" / "index.html").read_text(),
+            '<h1>Blog, page 1</h1><div><ul class="listing"><li>'
+            '<a href="/site/blog/p01">Post 2024-01-01</a> <time>2024-01-01</time>'
+            '</li></ul><nav class="pagination"><a href="/site/blog">Newer</a>'
+            "</nav></div>",
+        )
+
+    def test_metadata_index_reads_only_changed_files(self):
+        metadata = self.metadata()
+        self.assertEqual(metadata.read, 5)
+        path = self.root / "metadata.json"
+        metadata.save(path)
+        metadata = MetadataIndex.load(path)
+        self.write("blog/p03/index.md", post("2024-01-03", "[new]") + "\nmore")
+        metadata.update(self.content, ["blog/p01/index.md", "blog/p03/index.md"])
+        self.assertEqual(metadata.read, 1)
+        self.assertEqual(metadata.meta("blog/p03/index.md")["tags"], ["new"])
+        self.assertEqual(
+            sorted(metadata.pages), ["blog/p01/index.md", "blog/p03/index.md"]
+        )
+
+    def test_malformed_front_matter_names_the_file(self):
+        self.write("blog/bad/index.md", "+++\ntitle = 'Bad'\n\n# Bad")
+        with self.assertRaisesRegex(ValueError, "^blog/bad/index.md: .*no closing"):
+            self.metadata()
+
+    def test_hand_written_index_wins(self):
+        self.write("blog/index.md", "# My blog")
+        pages = Listings(["blog"], per_page=2).pages(self.metadata(), self.layouts)
+        self.assertNotIn("blog/index.html", [page.output for page in pages])
+
+    def test_only_affected_listings_are_rewritten(self):
+        self.assertIn("Generated 4/4 listing pages", self.build())
+        self.assertIn("Generated 0/4 listing pages", self.build())
+        # the oldest post only lands on the last page, and adds a tag page
+        self.write("blog/p00/index.md", post("2023-12-31", "[hobbits]"))
+        out = self.build()
+        self.assertIn("Generated 2/5 listing pages", out)
+        self.assertIn("blog/page/1/index.html", out)
+        self.assertIn("tags/hobbits/index.html", out)
+        (self.content / "blog" / "p00" / "index.md").unlink()
+        out = self.build()
+        self.assertIn("Generated 1/4 listing pages, removed 1 stale listings", out)
+        self.assertFalse((self.docs / "tags" / "hobbits").exists())
+
+    def test_new_posts_rewrite_a_bounded_number_of_pages(self):
+        for day in range(4, 10):
+            self.write(f"blog/p{day:02}/index.md", post(f"2024-01-{day:02}"))
+        self.build()
+        oldest = (self.docs / "blog" / "page" / "1" / "index.html").read_text()
+        for day in range(10, 20):
+            self.write(f"blog/p{day}/index.md", post(f"2024-01-{day}"))
+            out = self.build()
+            # the index, the newest archive page and, when that one is new,
+            # the one before it for its newer link
+            self.assertLessEqual(out.count("Generating listing"), 3)
+            self.assertIn("blog/index.html", out)
+            self.assertNotIn("blog/page/1/index.html", out)
+        self.assertEqual(
+            (self.docs / "blog" / "page" / "1" / "index.html").read_text(), oldest
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.functions import collect_page_jobs, generate_pages_recursive
+from static_site.parallel import generate_pages_recursive_parallel
+
+
+class PageTreeTestCase(unittest.TestCase):
+    """
+    Twelve pages in three sections, for comparing builds against the serial one.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.content = self.root / "content"
+        self.template = self.root / "template.html"
+        self.template.write_text('<a href="/">{{ Title }}</a>{{ Content }}')
+        for i in range(12):
+            page = self.content / f"section{i % 3}" / f"page{i}"
+            page.mkdir(parents=True)
+            (page / "index.md").write_text(f"# Page {i}\n\nSome **bold** text {i}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, root: Path):
+        return {
+            path.relative_to(root).as_posix(): path.read_text()
+            for path in root.rglob("*.html")
+        }
+
+
+class TestParallel(PageTreeTestCase):
+    def test_collect_page_jobs(self):
+        jobs = collect_page_jobs(self.content, self.root / "docs")
+        self.assertEqual(len(jobs), 12)
+        self.assertEqual(jobs, sorted(jobs))
+        self.assertEqual(
+            jobs[0][1], self.root / "docs" / "section0" / "page0" / "index.html"
+        )
+
+    def test_matches_serial_output(self):
+        serial, parallel = self.root / "serial", self.root / "parallel"
+        with redirect_stdout(StringIO()) as serial_log:
+            generate_pages_recursive(self.content, self.template, serial, "/site/")
+        with redirect_stdout(StringIO()) as parallel_log:
+            generate_pages_recursive_parallel(
+                self.content, self.template, parallel, "/site/", workers=3
+            )
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+        self.assertEqual(
+            serial_log.getvalue().replace(str(serial), ""),
+            parallel_log.getvalue().replace(str(parallel), ""),
+        )
+
+    def test_error_is_reraised(self):
+        (self.content / "section1" / "page1" / "index.md").write_text("no title")
+        with redirect_stdout(StringIO()), self.assertRaises(ValueError):
+            generate_pages_recursive_parallel(
+                self.content, self.template, self.root / "docs", "/", workers=3
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from static_site.serve import LiveReload, SiteBuilder, diff_snapshots, snapshot
+
+
+class TestServe(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "static").mkdir()
+        (self.root / "content" / "blog").mkdir(parents=True)
+        (self.root / "static" / "index.css").write_text("body {}")
+        (self.root / "content" / "index.md").write_text("# Home")
+        (self.root / "content" / "blog" / "index.md").write_text("# Blog")
+        (self.root / "template.html").write_text("{{ Title }}")
+        self.builder = SiteBuilder(
+            self.root / "static",
+            self.root / "content",
+            self.root / "template.html",
+            self.root / "docs",
+        )
+        with redirect_stdout(StringIO()):
+            self.builder.full_build()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def apply(self, changed=(), removed=()):
+        with redirect_stdout(StringIO()) as out:
+            count = self.builder.apply(
+                {os.fspath(p) for p in changed}, {os.fspath(p) for p in removed}
+            )
+        return count, out.getvalue()
+
+    def test_snapshot_and_diff(self):
+        before = snapshot(self.root / "content", self.root / "template.html")
+        self.assertEqual(len(before), 3)
+        page = self.root / "content" / "blog" / "index.md"
+        page.write_text("# Blog, updated")
+        (self.root / "content" / "index.md").unlink()
+        changed, removed = diff_snapshots(before, snapshot(self.root / "content"))
+        self.assertEqual(changed, {os.fspath(page)})
+        self.assertIn(os.fspath(self.root / "content" / "index.md"), removed)
+
+    def test_only_touched_page_is_rebuilt(self):
+        page = self.root / "content" / "blog" / "index.md"
+        page.write_text("# Blog, updated")
+        count, out = self.apply(changed=[page])
+        self.assertEqual(count, 1)
+        self.assertEqual(out.count("Generating page"), 1)
+        self.assertEqual(
+            (self.root / "docs" / "blog" / "index.html").read_text(), "Blog, updated"
+        )
+
+    def test_template_change_rebuilds_every_page(self):
+        template = self.root / "template.html"
+        template.write_text("<h1>{{ Title }}</h1>")
+        count, _ = self.apply(changed=[template])
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            (self.root / "docs" / "index.html").read_text(), "<h1>Home</h1>"
+        )
+
+    def test_partial_change_rebuilds_dependent_pages(self):
+        partials = self.root / "templates" / "partials"
+        partials.mkdir(parents=True)
+        (partials / "nav.html").write_text("<nav></nav>")
+        blog = self.root / "templates" / "blog.html"
+        blog.write_text("{{> nav }}{{ Title }}")
+        count, _ = self.apply(changed=[blog, partials / "nav.html"])
+        self.assertEqual(count, 1)
+        (partials / "nav.html").write_text("<nav>x</nav>")
+        count, _ = self.apply(changed=[partials / "nav.html"])
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            (self.root / "docs" / "blog" / "index.html").read_text(),
+            "<nav>x</nav>Blog",
+        )
+        self.assertEqual((self.root / "docs" / "index.html").read_text(), "Home")
+
+    def test_removed_asset_is_deleted(self):
+        css = self.root / "static" / "index.css"
+        css.unlink()
+        count, _ = self.apply(removed=[css])
+        self.assertEqual(count, 1)
+        self.assertFalse((self.root / "docs" / "index.css").exists())
+
+    def test_render_error_does_not_raise(self):
+        page = self.root / "content" / "index.md"
+        page.write_text("no title")
+        count, out = self.apply(changed=[page])
+        self.assertEqual(count, 0)
+        self.assertIn("Error: No title found", out)
+
+    def test_livereload_wait(self):
+        livereload = LiveReload()
+        self.assertEqual(livereload.wait(0, timeout=0.01), 0)
+        livereload.bump()
+        self.assertEqual(livereload.wait(0, timeout=0.01), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
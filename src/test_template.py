@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from static_site.htmlnode import LeafNode, ParentNode
+from static_site.template import Include, Slot, Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = Template("<title>{{ Title }}</title>{{Content}}!")
+        self.assertEqual(
+            template.segments,
+            ["<title>", Slot("Title", ""), "</title>", Slot("Content", ""), "!"],
+        )
+        self.assertEqual(template.slots, {"Title", "Content"})
+
+    def test_includes(self):
+        template = Template("{{> nav }}<h1>{{ Title }}</h1>{{>partials/footer}}")
+        self.assertEqual(
+            template.segments,
+            [
+                Include("nav", ""),
+                "<h1>",
+                Slot("Title", ""),
+                "</h1>",
+                Include("partials/footer", ""),
+            ],
+        )
+        self.assertEqual(template.includes, {"nav", "partials/footer"})
+        with self.assertRaisesRegex(ValueError, "not expanded"):
+            template.render({"Title": "x"})
+
+    def test_render_arbitrary_slots(self):
+        template = Template("{{ Title }} by {{ author }} on {{ date }}")
+        self.assertEqual(
+            template.render({"Title": "Post", "author": "Tom", "date": "2024-01-01"}),
+            "Post by Tom on 2024-01-01",
+        )
+
+    def test_missing_slot_is_left_as_written(self):
+        template = Template("<h1>{{ Title }}</h1>{{  Missing }}")
+        self.assertEqual(template.render({"Title": "x"}), "<h1>x</h1>{{  Missing }}")
+
+    def test_streams_html_nodes(self):
+        template = Template("<main>{{ Content }}</main>")
+        node = ParentNode("p", [LeafNode("b", "hi")])
+        buffer = StringIO()
+        template.write({"Content": node}, buffer)
+        self.assertEqual(buffer.getvalue(), "<main><p><b>hi</b></p></main>")
+
+    def test_with_basepath(self):
+        template = Template('<link href="/index.css" /><img src="/a.png" />{{ X }}')
+        rebased = template.with_basepath("/site/")
+        self.assertEqual(
+            rebased.render({"X": 'href="/'}),
+            '<link href="/site/index.css" /><img src="/site/a.png" />href="/',
+        )
+        self.assertIs(rebased, template.with_basepath("/site/"))
+        self.assertIs(template, template.with_basepath("/"))
+
+    def test_with_basepath_skips_protocol_relative_urls(self):
+        template = Template(
+            '<link href="//cdn.example.com/a.css"><script src="//x.dev/a.js">'
+        )
+        self.assertEqual(
+            template.with_basepath("/site/").render({}),
+            '<link href="//cdn.example.com/a.css"><script src="//x.dev/a.js">',
+        )
+
+    def test_load_template_is_cached_until_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "template.html"
+            path.write_text("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(first, load_template(path))
+            path.write_text("<b>{{ Title }}</b>")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_template(path).render({"Title": "x"}), "<b>x</b>")
+
+
+if __name__ == "__main__":
+    unittest.main()
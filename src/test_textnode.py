@@ -1,7 +1,7 @@
 import unittest
 
-from textnode import TextNode, TextType
-from functions import (
+from static_site.textnode import TextNode, TextType
+from static_site.functions import (
     text_node_to_html_node,
     split_nodes_delimiter,
     extract_markdown_images,
@@ -27,6 +27,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, self.url)
         self.assertEqual(node2.url, self.url)
 
+    def test_text_type_value(self):
+        node = TextNode("This is a text node", "bold")
+        self.assertIs(node.text_type, TextType.BOLD)
+        self.assertRaises(ValueError, TextNode, "x", "underline")
+
     def test_diff(self):
         node = TextNode("This is a text node", TextType.BOLD)
         node2 = TextNode("This is a not text node", TextType.ITALIC)